@@ -5,7 +5,7 @@ from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 from apps.api_logs.models import APILog, ErrorLog
-from apps.authentication.models import User
+from apps.authentication.models import RevokedToken, User
 from apps.blog.models import Post
 from apps.database import Base
 from apps.stock.models import Stock, StockHistory
@@ -25,6 +25,14 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# full-text search objects created by raw DDL, see apps/blog/models/post.py
+SEARCH_OBJECTS = {"search_vector", "ix_posts_search_vector", "posts_fts"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and (name in SEARCH_OBJECTS or name.startswith("posts_fts")))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,6 +55,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -69,7 +78,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
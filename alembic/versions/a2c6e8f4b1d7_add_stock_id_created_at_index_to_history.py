@@ -0,0 +1,34 @@
+"""add (stock_id, created_at, id) index to stock_history
+
+Revision ID: a2c6e8f4b1d7
+Revises: f1b8d4e6a9c3
+Create Date: 2026-10-18 17:05:44.902316
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a2c6e8f4b1d7"
+down_revision: Union[str, Sequence[str], None] = "f1b8d4e6a9c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_stock_history_stock_id_created_at_id",
+        "stock_history",
+        ["stock_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_stock_history_stock_id_created_at_id", table_name="stock_history")
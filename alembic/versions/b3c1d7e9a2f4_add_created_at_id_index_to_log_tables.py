@@ -0,0 +1,35 @@
+"""add (created_at, id) index to log tables
+
+Revision ID: b3c1d7e9a2f4
+Revises: ea9bb12b5ed2
+Create Date: 2026-10-18 09:12:41.203518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3c1d7e9a2f4"
+down_revision: Union[str, Sequence[str], None] = "ea9bb12b5ed2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_api_logs_created_at_id", "api_logs", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_error_logs_created_at_id", "error_logs", ["created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_error_logs_created_at_id", table_name="error_logs")
+    op.drop_index("ix_api_logs_created_at_id", table_name="api_logs")
@@ -0,0 +1,127 @@
+"""store stocks.last_updated as a UTC timestamp
+
+Revision ID: b7d3f9a1c5e2
+Revises: a2c6e8f4b1d7
+Create Date: 2026-10-18 19:12:06.540218
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3f9a1c5e2"
+down_revision: Union[str, Sequence[str], None] = "a2c6e8f4b1d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def parse_last_updated(value, created_at):
+    """The text column as a UTC datetime
+
+    It was written by datetime.now().isoformat() on the app hosts, so naive
+    values are taken in this host's local time. Whatever a client stored
+    that does not parse falls back to the row's created_at.
+    """
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except (AttributeError, ValueError):
+        # read back naive on SQLite, where it is UTC
+        if created_at.tzinfo is None:
+            return created_at.replace(tzinfo=timezone.utc)
+        return created_at.astimezone(timezone.utc)
+    # astimezone() takes a naive value as local time
+    return parsed.astimezone(timezone.utc)
+
+
+def format_last_updated(value, created_at):
+    """A UTC datetime as the text column stored it, local time without offset"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone().replace(tzinfo=None).isoformat()
+
+
+def _backfill(source: str, source_type, target: str, target_type, convert) -> None:
+    """Fill column `target` with convert(source, created_at) for every stock"""
+    connection = op.get_bind()
+    stocks = sa.table(
+        "stocks",
+        sa.column("id", sa.Integer),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+        sa.column(source, source_type),
+        sa.column(target, target_type),
+    )
+    update = (
+        stocks.update()
+        .where(stocks.c.id == sa.bindparam("stock_id"))
+        .values({target: sa.bindparam("value")})
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(stocks.c.id, stocks.c.created_at, stocks.c[source])
+            .where(stocks.c.id > last_id)
+            .order_by(stocks.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            update,
+            [
+                {"stock_id": stock_id, "value": convert(value, created_at)}
+                for stock_id, created_at, value in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "stocks",
+        sa.Column("last_updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    _backfill(
+        "last_updated",
+        sa.String(50),
+        "last_updated_at",
+        sa.DateTime(timezone=True),
+        parse_last_updated,
+    )
+    with op.batch_alter_table("stocks") as batch_op:
+        batch_op.drop_column("last_updated")
+        batch_op.alter_column(
+            "last_updated_at",
+            new_column_name="last_updated",
+            existing_type=sa.DateTime(timezone=True),
+            nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "stocks", sa.Column("last_updated_text", sa.String(length=50), nullable=True)
+    )
+    _backfill(
+        "last_updated",
+        sa.DateTime(timezone=True),
+        "last_updated_text",
+        sa.String(50),
+        format_last_updated,
+    )
+    with op.batch_alter_table("stocks") as batch_op:
+        batch_op.drop_column("last_updated")
+        batch_op.alter_column(
+            "last_updated_text",
+            new_column_name="last_updated",
+            existing_type=sa.String(length=50),
+            nullable=False,
+        )
@@ -0,0 +1,34 @@
+"""add (author_id, created_at, id) index to posts
+
+Revision ID: d9f2b5c7e3a1
+Revises: c4e8a1f0b6d2
+Create Date: 2026-10-18 12:40:05.317462
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9f2b5c7e3a1"
+down_revision: Union[str, Sequence[str], None] = "c4e8a1f0b6d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_posts_author_id_created_at_id",
+        "posts",
+        ["author_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_posts_author_id_created_at_id", table_name="posts")
@@ -0,0 +1,85 @@
+"""add full-text search to posts
+
+Revision ID: e5a7c3d1f8b4
+Revises: d9f2b5c7e3a1
+Create Date: 2026-10-18 14:18:52.640193
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a7c3d1f8b4"
+down_revision: Union[str, Sequence[str], None] = "d9f2b5c7e3a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# copies of the DDL in apps/blog/models/post.py as of this revision, so the
+# migration does not change when the app code does
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)",
+]
+
+# external content FTS5 table kept in sync with posts by triggers
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # the generated column is filled for existing rows by the ALTER itself
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_posts_search_vector", table_name="posts")
+        op.drop_column("posts", "search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("posts_fts_insert", "posts_fts_delete", "posts_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS posts_fts")
@@ -0,0 +1,97 @@
+"""add excerpt, word_count and reading_time to posts
+
+Revision ID: f1b8d4e6a9c3
+Revises: e5a7c3d1f8b4
+Create Date: 2026-10-18 15:47:30.118254
+
+"""
+
+import math
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b8d4e6a9c3"
+down_revision: Union[str, Sequence[str], None] = "e5a7c3d1f8b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+# defaults of EXCERPT_LENGTH / WORDS_PER_MINUTE when this revision was written
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+
+
+def content_stats(content) -> dict:
+    """Copy of apps.blog.models.post.content_stats as of this revision
+
+    Kept here so the backfill does not change when the app code does.
+    """
+    words = (content or "").split()
+    excerpt = " ".join(words)
+    if len(excerpt) > EXCERPT_LENGTH:
+        cut = excerpt.rfind(" ", 0, EXCERPT_LENGTH + 1)
+        excerpt = excerpt[: cut if cut > 0 else EXCERPT_LENGTH].rstrip() + "..."
+    return {
+        "excerpt": excerpt if content is not None else None,
+        "word_count": len(words),
+        "reading_time": math.ceil(len(words) / WORDS_PER_MINUTE),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("posts", sa.Column("excerpt", sa.Text(), nullable=True))
+    op.add_column(
+        "posts",
+        sa.Column("word_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "posts",
+        sa.Column("reading_time", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # backfill with the function the model used on write at this revision
+    connection = op.get_bind()
+    posts = sa.table(
+        "posts",
+        sa.column("id", sa.Integer),
+        sa.column("content", sa.Text),
+        sa.column("excerpt", sa.Text),
+        sa.column("word_count", sa.Integer),
+        sa.column("reading_time", sa.Integer),
+    )
+    update = (
+        posts.update()
+        .where(posts.c.id == sa.bindparam("post_id"))
+        .values(
+            excerpt=sa.bindparam("excerpt"),
+            word_count=sa.bindparam("word_count"),
+            reading_time=sa.bindparam("reading_time"),
+        )
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(posts.c.id, posts.c.content)
+            .where(posts.c.id > last_id)
+            .order_by(posts.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            update,
+            [{"post_id": row.id, **content_stats(row.content)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("posts", "reading_time")
+    op.drop_column("posts", "word_count")
+    op.drop_column("posts", "excerpt")
@@ -1,13 +1,15 @@
 import json
 import traceback
-from typing import Callable
+from datetime import datetime, timezone
 
+from decouple import config
 from fastapi import Request, Response
-from sqlalchemy.orm import Session
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from apps.api_logs.models import APILog, ErrorLog
-from apps.database import SessionLocal, get_db
+from apps.api_logs.writer import log_writer
+
+# Only this many bytes of each request/response body are kept for the log
+API_LOG_BODY_LIMIT = config("API_LOG_BODY_LIMIT", default=64 * 1024, cast=int)
 
 # class APILoggingMiddleware(BaseHTTPMiddleware):
 #     async def dispatch(self, request: Request, call_next: Callable) -> Response:
@@ -132,82 +134,124 @@ from apps.database import SessionLocal, get_db
 #         )
 
 
-class APILoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response_body = b""
+class _BoundedBuffer:
+    """Keep the first `limit` bytes written to it and remember the full size"""
+
+    __slots__ = ("data", "size", "limit")
+
+    def __init__(self, limit: int):
+        self.data = bytearray()
+        self.size = 0
+        self.limit = limit
+
+    def write(self, chunk: bytes) -> None:
+        room = self.limit - len(self.data)
+        if room > 0 and chunk:
+            self.data += chunk[:room]
+        self.size += len(chunk)
+
+    @property
+    def truncated(self) -> bool:
+        return self.size > len(self.data)
+
+
+def _request_json(buffer: _BoundedBuffer):
+    if not buffer.size or buffer.truncated:
+        return None
+    try:
+        return json.loads(buffer.data)
+    except ValueError:
+        return None
+
+
+def _api_log_row(request: Request, body, response_content: str, status_code: int):
+    return {
+        "url": str(request.url),
+        "method": request.method,
+        "ip": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent"),
+        "body": body,
+        "header": dict(request.headers),
+        "response": response_content,
+        "status_code": str(status_code),
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def _error_log_row(request: Request, body, exc: Exception):
+    return {
+        "url": str(request.url),
+        "method": request.method.lower(),
+        "body": body,
+        "header": dict(request.headers),
+        "response": "".join(
+            traceback.format_exception(type(exc), exc, exc.__traceback__)
+        ),
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+class APILoggingMiddleware:
+    """Log non-GET calls to api_logs and unhandled errors to error_logs
+
+    Plain ASGI middleware: response messages are forwarded to the client as
+    they are sent, and only the first API_LOG_BODY_LIMIT bytes of the request
+    and response bodies are copied for the log, so streamed and large
+    responses are never buffered. Rows are handed to the background log_writer
+    so no insert or commit happens on the request path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        # Skip GET requests, they are only logged when they fail
+        log_call = scope["method"].upper() != "GET"
+        request_body = _BoundedBuffer(API_LOG_BODY_LIMIT)
+        response_body = _BoundedBuffer(API_LOG_BODY_LIMIT)
         response_status = 500
-        response_headers = {}
-        response_media_type = "application/json"
-        body = None
+        response_started = False
 
-        try:
-            # Skip GET requests
-            if request.method.upper() != "GET":
-                # Read request body
-                try:
-                    body = await request.json()
-                except Exception:
-                    body = None
-
-            # Get response
-            response = await call_next(request)
-
-            # Read response body safely
-            response_body = b""
-            async for chunk in response.body_iterator:
-                response_body += chunk
-
-            # Convert response to string for logging
-            try:
-                response_content = json.dumps(json.loads(response_body.decode()))
-            except Exception:
-                response_content = response_body.decode()
-
-            # Save metadata
-            response_status = response.status_code
-            response_headers = dict(response.headers)
-            response_media_type = response.media_type
-
-            # Log API call
-            if request.method.upper() != "GET":
-                db: Session = next(get_db())
-                api_log = APILog(
-                    url=str(request.url),
-                    method=request.method,
-                    ip=request.client.host if request.client else None,
-                    user_agent=request.headers.get("user-agent"),
-                    body=body,
-                    header=dict(request.headers),
-                    response=response_content,
-                    status_code=str(response_status),
-                )
-                db.add(api_log)
-                db.commit()
+        async def receive_and_capture():
+            message = await receive()
+            if log_call and message["type"] == "http.request":
+                request_body.write(message.get("body", b""))
+            return message
+
+        async def send_and_capture(message):
+            nonlocal response_status, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                response_status = message["status"]
+            elif log_call and message["type"] == "http.response.body":
+                response_body.write(message.get("body", b""))
+            await send(message)
 
+        try:
+            await self.app(scope, receive_and_capture, send_and_capture)
         except Exception as exc:
-            # Log errors
-            db: Session = next(get_db())
-            error_log = ErrorLog(
-                url=str(request.url),
-                method=request.method.lower(),
-                body=body if "body" in locals() else None,
-                header=dict(request.headers),
-                response="".join(
-                    traceback.format_exception(type(exc), exc, exc.__traceback__)
+            log_writer.enqueue(
+                ErrorLog, _error_log_row(request, _request_json(request_body), exc)
+            )
+            if response_started:
+                raise
+            # Same as before: an empty 500 instead of the error details
+            response = Response(status_code=500, media_type="application/json")
+            await response(scope, receive, send)
+            return
+
+        if log_call:
+            log_writer.enqueue(
+                APILog,
+                _api_log_row(
+                    request,
+                    _request_json(request_body),
+                    response_body.data.decode("utf-8", errors="replace"),
+                    response_status,
                 ),
             )
-            db.add(error_log)
-            db.commit()
-            # Override response with error
-            # response_body = json.dumps({"detail": str(exc)}).encode()
-            # response_status = 500
-            # response_headers = {"content-type": "application/json"}
-            # response_media_type = "application/json"
-
-        # Return the original response content safely
-        return Response(
-            content=response_body,
-            status_code=response_status,
-            headers=response_headers,
-            media_type=response_media_type,
-        )
@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import JSON, Column, Enum, Integer, String
+from sqlalchemy import JSON, Column, Enum, Index, Integer, String
 
 from base.models import BaseModel
 
@@ -15,6 +15,8 @@ class HTTPMethod(str, enum.Enum):
 
 class APILog(BaseModel):
     __tablename__ = "api_logs"
+    # keyset pagination walks (created_at, id) newest first
+    __table_args__ = (Index("ix_api_logs_created_at_id", "created_at", "id"),)
 
     url = Column(String(255), nullable=False)
     method = Column(String(50), nullable=False)
@@ -33,6 +35,7 @@ class APILog(BaseModel):
 
 class ErrorLog(BaseModel):
     __tablename__ = "error_logs"
+    __table_args__ = (Index("ix_error_logs_created_at_id", "created_at", "id"),)
 
     url = Column(String(255), nullable=False)
 
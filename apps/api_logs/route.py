@@ -1,13 +1,24 @@
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from apps.database import get_db
-from base.pagination import paginate
+from apps.database import get_read_db
+from base.export import ExportFormat, export_response
+from base.pagination import CountMode, PaginationError, paginate
+from base.responses import error_json_response, success_json_response
 from base.route import StandardResponse
 
 from .models import APILog, ErrorLog
-from .schemas import APILogList, APILogRetrieve, ErrorLogList, ErrorLogRetrieve
+from .schemas import (
+    APILogExport,
+    APILogList,
+    APILogRetrieve,
+    ErrorLogList,
+    ErrorLogRetrieve,
+)
 
 router = APIRouter()
 
@@ -16,30 +27,54 @@ router = APIRouter()
 def list_api_logs(
     page: int = 1,
     page_size: int = 10,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,  # keyset paging, empty for the first page
+    count: CountMode = CountMode.exact,
+    fields: Optional[str] = None,  # comma separated sparse fieldset
+    db: Session = Depends(get_read_db),
 ):
     """List all API logs"""
-    result = paginate(
-        query=db.query(APILog).order_by(APILog.created_at.desc()),
-        page=page,
-        page_size=page_size,
-        schema=APILogList,
+    try:
+        result = paginate(
+            query=db.query(APILog).order_by(APILog.created_at.desc(), APILog.id.desc()),
+            page=page,
+            page_size=page_size,
+            schema=APILogList,
+            cursor=cursor,
+            count=count,
+            fields=fields,
+        )
+    except PaginationError as exc:
+        return error_json_response(message=str(exc))
+
+    return success_json_response(
+        data=result.data,
+        message="API logs fetched successfully.",
+        meta=result.meta,
     )
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=StandardResponse.success_response(
-            data=result.data,
-            message="API logs fetched successfully.",
-            meta=result.meta,
-        ).model_dump(mode="json"),
+
+@router.get("/export")
+def export_api_logs(
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Stream API logs created in [start, end) as NDJSON or CSV"""
+    query = db.query(APILog).order_by(APILog.created_at, APILog.id)
+    if start is not None:
+        query = query.filter(APILog.created_at >= start)
+    if end is not None:
+        query = query.filter(APILog.created_at < end)
+    return export_response(
+        query=query, schema=APILogExport, format=format, filename="api_logs"
     )
 
 
 @router.get("/retrieve/{log_id}", response_model=StandardResponse)
 def retrieve_api_logs(
     log_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Retrieve a specific API log by ID"""
     result = db.query(APILog).filter(APILog.id == log_id).first()
@@ -65,15 +100,26 @@ def retrieve_api_logs(
 def list_error_logs(
     page: int = 1,
     page_size: int = 10,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,  # keyset paging, empty for the first page
+    count: CountMode = CountMode.exact,
+    fields: Optional[str] = None,  # comma separated sparse fieldset
+    db: Session = Depends(get_read_db),
 ):
     """List all error logs"""
-    result = paginate(
-        query=db.query(ErrorLog).order_by(ErrorLog.created_at.desc()),
-        page=page,
-        page_size=page_size,
-        schema=ErrorLogList,
-    )
+    try:
+        result = paginate(
+            query=db.query(ErrorLog).order_by(
+                ErrorLog.created_at.desc(), ErrorLog.id.desc()
+            ),
+            page=page,
+            page_size=page_size,
+            schema=ErrorLogList,
+            cursor=cursor,
+            count=count,
+            fields=fields,
+        )
+    except PaginationError as exc:
+        return error_json_response(message=str(exc))
     if not result.data:
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,20 +128,36 @@ def list_error_logs(
             ).model_dump(),
         )
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=StandardResponse.success_response(
-            data=result.data,
-            message="Error logs fetched successfully.",
-            # meta=result.meta,
-        ).model_dump(mode="json"),
+    return success_json_response(
+        data=result.data,
+        message="Error logs fetched successfully.",
+        meta=result.meta,
+    )
+
+
+# declared before /error-logs/{log_id} so "export" is not parsed as an id
+@router.get("/error-logs/export")
+def export_error_logs(
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Stream error logs created in [start, end) as NDJSON or CSV"""
+    query = db.query(ErrorLog).order_by(ErrorLog.created_at, ErrorLog.id)
+    if start is not None:
+        query = query.filter(ErrorLog.created_at >= start)
+    if end is not None:
+        query = query.filter(ErrorLog.created_at < end)
+    return export_response(
+        query=query, schema=ErrorLogRetrieve, format=format, filename="error_logs"
     )
 
 
 @router.get("/error-logs/{log_id}", response_model=StandardResponse)
 def retrieve_error_log(
     log_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Retrieve a specific error log by ID"""
     result = db.query(ErrorLog).filter(ErrorLog.id == log_id).first()
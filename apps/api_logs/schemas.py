@@ -8,7 +8,7 @@ class APILogCreate(BaseModel):
     method: str
     ip: str | None = None
     user_agent: str | None = None
-    body: dict | None = {}
+    body: dict | list | None = {}
     header: dict | None = None
     response: dict | None = None
     system_details: dict | None = {}
@@ -41,7 +41,7 @@ class APILogRetrieve(BaseModel):
     method: str
     ip: str | None = None
     user_agent: str | None = None
-    body: dict | None = {}
+    body: dict | list | None = {}
     header: dict | None = None
     # response: dict | None = None
     response: dict | list | str | None = None
@@ -54,12 +54,16 @@ class APILogRetrieve(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class APILogExport(APILogRetrieve):
+    created_at: datetime.datetime
+
+
 class ErrorLogCreate(BaseModel):
     url: str
     method: str
     ip: str | None = None
     user_agent: str | None = None
-    body: dict | None = {}
+    body: dict | list | None = {}
     header: dict | None = None
     response: dict | None = None
     system_details: dict | None = {}
@@ -74,7 +78,7 @@ class ErrorLogList(BaseModel):
     method: str
     ip: str | None = None
     user_agent: str | None = None
-    body: dict | None = {}
+    body: dict | list | None = {}
     # header: dict | None = None
     # response: dict | list | str | None = None
 
@@ -93,7 +97,7 @@ class ErrorLogRetrieve(BaseModel):
     method: str
     ip: str | None = None
     user_agent: str | None = None
-    body: dict | None = {}
+    body: dict | list | None = {}
     header: dict | None = None
     # response: dict | None = None
     response: dict | list | str | None = None
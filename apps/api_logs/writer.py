@@ -0,0 +1,159 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from decouple import config
+from sqlalchemy import insert
+
+from apps.database import SessionLocal
+
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+LOG_BATCH_SIZE = config("LOG_BATCH_SIZE", default=500, cast=int)
+LOG_FLUSH_INTERVAL = config("LOG_FLUSH_INTERVAL", default=1.0, cast=float)
+
+logger = logging.getLogger(__name__)
+
+
+class LogWriter:
+    """Buffer APILog/ErrorLog rows in memory and bulk insert them from a thread
+
+    A batch is flushed once it holds `batch_size` rows or `flush_interval`
+    seconds after its first row, whichever comes first. When the queue is full
+    new rows are dropped and counted instead of blocking the request.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        queue_size: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._counters = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    def _incr(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher thread and write whatever is still queued"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._flush(self._drain(self._queue.qsize()))
+
+    def enqueue(self, model, row: Dict) -> bool:
+        """Queue one row for `model`, returns False if it had to be dropped"""
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((model, row))
+        except queue.Full:
+            self._incr("dropped")
+            return False
+        self._incr("enqueued")
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            data = dict(self._counters)
+        data["queued"] = self._queue.qsize()
+        data["queue_size"] = self._queue.maxsize
+        data["running"] = self._thread is not None and self._thread.is_alive()
+        return data
+
+    def _drain(self, limit: int) -> List[Tuple]:
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                batch.extend(self._drain(self.batch_size - len(batch)))
+            self._flush(batch)
+
+    def _flush(self, items: List[Tuple]) -> None:
+        if not items:
+            return
+        rows_by_model: Dict = {}
+        for model, row in items:
+            rows_by_model.setdefault(model, []).append(row)
+
+        db = self.session_factory()
+        try:
+            for model, rows in rows_by_model.items():
+                written = self._insert(db, model, rows)
+                if written:
+                    self._incr("written", written)
+                if written < len(rows):
+                    self._incr("failed", len(rows) - written)
+            self._incr("batches")
+        finally:
+            db.close()
+
+    def _insert(self, db, model, rows: List[Dict]) -> int:
+        """Insert `rows` and return how many were written
+
+        One bad row (too long for a column, a value outside an enum) must not
+        cost the whole batch, so a failed batch is retried row by row.
+        """
+        try:
+            # executemany, batched into multi-row INSERTs by the dialect
+            db.execute(insert(model), rows)
+            db.commit()
+            return len(rows)
+        except Exception:
+            db.rollback()
+            if len(rows) == 1:
+                logger.exception("Failed to write a %s row", model.__name__)
+                return 0
+        written = 0
+        for row in rows:
+            written += self._insert(db, model, [row])
+        return written
+
+
+log_writer = LogWriter()
@@ -1,27 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from apps.authentication.authentication import (
     create_access_token,
     create_refresh_token,
+    decode_token,
     get_current_active_user,
     get_current_user,
-    verify_token,
+    revoke_token,
+    security,
 )
+from apps.authentication.cache import Principal, user_cache
 from apps.authentication.models.models import User
 from apps.authentication.schemas import UserCreate, UserLogin, UserRetrieve
-from apps.authentication.utils import hash_password, verify_password
-from apps.blog.schemas import PostList
+from apps.authentication.throttling import (
+    client_ip,
+    login_ip_throttle,
+    login_username_throttle,
+    register_ip_throttle,
+)
+from apps.authentication.utils import (
+    hash_password,
+    verify_and_update_password,
+    verify_password,
+)
+from apps.blog.models.post import Post
+from apps.blog.schemas import PostList, PostSummary
 from apps.database import get_db
+from base.pagination import PaginationError, paginate
+from base.responses import error_json_response, success_json_response
 from base.route import StandardResponse
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=StandardResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+def register(user: UserCreate, request: Request, db: Session = Depends(get_db)):
     """Register a new user"""
+    register_ip_throttle.check(client_ip(request))
     # Check if user already exists
     existing_user = (
         db.query(User)
@@ -76,12 +97,20 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+def login(user_credentials: UserLogin, request: Request, db: Session = Depends(get_db)):
     """Login user and return JWT tokens"""
+    # throttle before the argon2 verification, every attempt costs a full hash
+    login_ip_throttle.check(client_ip(request))
+    login_username_throttle.check(user_credentials.username.lower())
     # Find user
     user = db.query(User).filter(User.username == user_credentials.username).first()
 
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    verified, new_hash = (
+        verify_and_update_password(user_credentials.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not verified:
         # raise HTTPException(
         #     status_code=status.HTTP_401_UNAUTHORIZED,
         #     detail="Invalid username or password",
@@ -106,6 +135,12 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             ).model_dump(),
         )
 
+    # hash was made with older argon2 parameters, upgrade it while we have
+    # the plain password
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+
     # Create tokens
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
@@ -143,8 +178,22 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_user)):
-    """Logout user (client-side token removal)"""
+def logout(
+    refresh_token: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+):
+    """Logout user by revoking its access token and, if given, refresh token"""
+    revoke_token(db, decode_token(credentials.credentials))
+    if refresh_token:
+        try:
+            payload = decode_token(refresh_token, token_type="refresh")
+        except HTTPException:
+            payload = None  # expired or already revoked, nothing left to do
+        if payload and int(payload["sub"]) == current_user.id:
+            revoke_token(db, payload)
+
     # return StandardResponse(
     #     success=True,
     #     data=None,
@@ -154,14 +203,34 @@ def logout(current_user: User = Depends(get_current_user)):
         status_code=status.HTTP_200_OK,
         content=StandardResponse.success_response(
             data=None,
-            message="Logout successful. Please remove token from client.",
+            message="Logout successful.",
         ).model_dump(),
     )
 
 
 @router.get("/profile")
-def get_me(current_user: User = Depends(get_current_active_user)):
-    """Get current authenticated user"""
+def get_me(
+    posts_cursor: str = "",  # next_cursor from posts_meta, empty for newest posts
+    posts_page_size: int = 10,
+    principal: Principal = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Get current authenticated user with a page of their newest posts"""
+    current_user = db.query(User).filter(User.id == principal.id).first()
+    # bounded keyset slice without content, both queries use the
+    # (author_id, created_at, id) index whatever the author's post count
+    try:
+        posts = paginate(
+            query=db.query(Post).filter(Post.author_id == principal.id),
+            page_size=min(posts_page_size, 100),
+            schema=PostSummary,
+            cursor=posts_cursor,
+        )
+    except PaginationError as exc:
+        return error_json_response(message=str(exc))
+    posts_count = (
+        db.query(func.count(Post.id)).filter(Post.author_id == principal.id).scalar()
+    )
     # return StandardResponse.success_response(
     #     data={
     #         "id": current_user.id,
@@ -172,27 +241,30 @@ def get_me(current_user: User = Depends(get_current_active_user)):
     #     },
     #     message="User Profile retrieved successfully",
     # )
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=StandardResponse.success_response(
-            data={
-                "id": current_user.id,
-                "username": current_user.username,
-                "email": current_user.email,
-                "is_active": current_user.is_active,
-                "posts": [PostList.model_validate(post) for post in current_user.posts],
-            },
-            message="User Profile retrieved successfully",
-        ).model_dump(),
+    return success_json_response(
+        data={
+            "id": current_user.id,
+            "username": current_user.username,
+            "email": current_user.email,
+            "is_active": current_user.is_active,
+            "posts": posts.data,
+            "posts_count": posts_count,
+            "posts_meta": posts.meta,
+        },
+        message="User Profile retrieved successfully",
     )
 
 
 @router.post("/refresh")
 def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
-    """Refresh access token using refresh token"""
+    """Refresh access token using refresh token
+
+    The refresh token is rotated: it is revoked and a new one is returned, so
+    replaying an already used refresh token fails.
+    """
     try:
-        user_id = verify_token(refresh_token)
-        user = db.query(User).filter(User.id == user_id).first()
+        payload = decode_token(refresh_token, token_type="refresh")
+        user = db.query(User).filter(User.id == int(payload["sub"])).first()
 
         if not user:
             # return StandardResponse.error_response(
@@ -206,8 +278,13 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
                 ).model_dump(),
             )
 
+        # unique jti in revoked_tokens makes this succeed for one caller only
+        if not revoke_token(db, payload):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
         # Create new access token
         new_access_token = create_access_token(data={"sub": str(user.id)})
+        new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
         # return StandardResponse.success_response(
         #     data={
@@ -221,6 +298,7 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
             content=StandardResponse.success_response(
                 data={
                     "access_token": new_access_token,
+                    "refresh_token": new_refresh_token,
                     "token_type": "bearer",
                 },
                 message="Token refreshed successfully",
@@ -244,10 +322,11 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
 def change_password(
     current_password: str,
     new_password: str,
-    current_user: User = Depends(get_current_active_user),
+    principal: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Change user password"""
+    current_user = db.query(User).filter(User.id == principal.id).first()
     # Verify current password
     if not verify_password(current_password, current_user.hashed_password):
         # return StandardResponse.error_response(
@@ -264,6 +343,8 @@ def change_password(
     # Update password
     current_user.hashed_password = hash_password(new_password)
     db.commit()
+    # the after_update hook already ran at flush, drop anything cached since
+    user_cache.invalidate(current_user.id)
 
     # return StandardResponse.success_response(message="Password changed successfully")
     return JSONResponse(
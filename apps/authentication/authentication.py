@@ -1,5 +1,6 @@
 import os
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import jwt
@@ -8,7 +9,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from apps.authentication.cache import Principal, user_cache
 from apps.authentication.models.models import User
+from apps.authentication.revocation import revocation_list
 from apps.database import get_db
 
 load_dotenv()
@@ -29,7 +32,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now() + expires_delta
     else:
         expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -38,40 +41,69 @@ def create_refresh_token(data: dict) -> str:
     """Create JWT refresh token"""
     to_encode = data.copy()
     expire = datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str) -> int:
-    """Verify JWT token and return user_id"""
+def decode_token(token: str, token_type: str = "access") -> dict:
+    """Verify JWT token and return its payload
+
+    Rejects expired, malformed and revoked tokens and tokens of another type.
+    The revocation check is in memory, see apps.authentication.revocation.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        token_type: str = payload.get("type")
-
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return int(user_id)
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    except jwt.InvalidTokenError:  # also covers ExpiredSignatureError
+        raise credentials_exception
+
+    if payload.get("sub") is None or payload.get("type") != token_type:
+        raise credentials_exception
+    # tokens issued before jti was added cannot be revoked, they just expire
+    jti = payload.get("jti")
+    if jti is not None and revocation_list.is_revoked(jti):
+        raise credentials_exception
+    return payload
+
+
+def verify_token(token: str, token_type: str = "access") -> int:
+    """Verify JWT token and return user_id"""
+    return int(decode_token(token, token_type)["sub"])
+
+
+def revoke_token(db: Session, payload: dict) -> bool:
+    """Revoke a decoded token until it expires, False if it already was"""
+    if payload.get("jti") is None:
+        return True
+    return revocation_list.revoke(
+        db,
+        jti=payload["jti"],
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+        user_id=int(payload["sub"]),
+        token_type=payload["type"],
+    )
 
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user"""
+) -> Principal:
+    """Get current authenticated user
+
+    Returns a cached Principal, the session only hits the database on a miss.
+    Endpoints that need other User columns must load the row themselves.
+    """
     token = credentials.credentials
     user_id = verify_token(token)
+    principal = user_cache.get(user_id)
+    if principal is not None:
+        return principal
+
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -79,11 +111,26 @@ def get_current_user(
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    principal = Principal.from_user(user)
+    user_cache.set(principal)
+    return principal
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+def get_current_superuser(
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
+    """Get current active user, who must be a superuser"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    return current_user
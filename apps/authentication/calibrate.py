@@ -0,0 +1,89 @@
+"""Pick argon2 cost parameters for this machine and write them to .env
+
+    python -m apps.authentication.calibrate --target-ms 250 --max-memory-mib 64
+
+Memory starts at the budget and time cost grows until one verification takes
+at least the target; when even time cost 1 is too slow, memory is halved.
+Existing hashes are upgraded to the new parameters on the next login.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from pathlib import Path
+
+from passlib.hash import argon2
+
+MIN_MEMORY_KIB = 8 * 1024
+MAX_TIME_COST = 20
+
+
+def measure_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int):
+    """Median wall time of one verification with the given parameters"""
+    handler = argon2.using(
+        rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    hashed = handler.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.verify("calibration-password", hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, max_memory_kib: int, parallelism: int, samples=5):
+    memory_cost = max_memory_kib
+    while True:
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            elapsed = measure_ms(time_cost, memory_cost, parallelism, samples)
+            print(
+                f"t={time_cost} m={memory_cost // 1024}MiB p={parallelism}: "
+                f"{elapsed:.1f} ms"
+            )
+            if elapsed >= target_ms:
+                break
+        too_slow = time_cost == 1 and elapsed > target_ms * 1.5
+        if not too_slow or memory_cost // 2 < MIN_MEMORY_KIB:
+            return {
+                "ARGON2_TIME_COST": time_cost,
+                "ARGON2_MEMORY_COST": memory_cost,
+                "ARGON2_PARALLELISM": parallelism,
+            }, elapsed
+        memory_cost //= 2
+
+
+def write_env(path: Path, values: dict) -> None:
+    """Replace or append KEY=VALUE lines, leaving the rest of the file alone"""
+    lines = path.read_text().splitlines() if path.exists() else []
+    remaining = dict(values)
+    for index, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key in remaining:
+            lines[index] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--max-memory-mib", type=int, default=64)
+    parser.add_argument("--parallelism", type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--env-file", type=Path, default=Path(".env"))
+    parser.add_argument("--dry-run", action="store_true", help="print the result only")
+    args = parser.parse_args(argv)
+
+    values, elapsed = calibrate(
+        args.target_ms, args.max_memory_mib * 1024, args.parallelism, args.samples
+    )
+    print(f"chosen: {values} ({elapsed:.1f} ms per verification)")
+    if not args.dry_run:
+        write_env(args.env_file, values)
+        print(f"written to {args.env_file}")
+
+
+if __name__ == "__main__":
+    main()
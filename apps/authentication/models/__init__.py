@@ -1,5 +1,6 @@
-from .models import User
+from .models import RevokedToken, User
 
 __all__ = [
+    "RevokedToken",
     "User",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
 from sqlalchemy.orm import relationship
 
 from apps.blog.models.post import Post
@@ -14,3 +14,12 @@ class User(BaseModel):
     is_superuser = Column(Boolean, default=False)
 
     posts = relationship("Post", back_populates="author")
+
+
+class RevokedToken(BaseModel):
+    __tablename__ = "revoked_tokens"
+    # unique so a refresh token can only be rotated once, even across workers
+    jti = Column(String(64), unique=True, index=True, nullable=False)
+    user_id = Column(Integer, index=True, nullable=True)
+    token_type = Column(String(20), nullable=False)
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)
@@ -0,0 +1,222 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from decouple import config
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from apps.authentication.models.models import RevokedToken
+from apps.database import SessionLocal
+
+TOKEN_REVOCATION_SYNC_INTERVAL = config(
+    "TOKEN_REVOCATION_SYNC_INTERVAL", default=5.0, cast=float
+)
+# every sync re-reads this many seconds of revocations before the newest one
+# seen, for transactions that commit after a later one already synced
+TOKEN_REVOCATION_SYNC_OVERLAP = config(
+    "TOKEN_REVOCATION_SYNC_OVERLAP", default=60.0, cast=float
+)
+TOKEN_REVOCATION_BLOOM_CAPACITY = config(
+    "TOKEN_REVOCATION_BLOOM_CAPACITY", default=100000, cast=int
+)
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = config(
+    "TOKEN_REVOCATION_BLOOM_ERROR_RATE", default=0.001, cast=float
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes, they are stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class BloomFilter:
+    """Fixed size Bloom filter over strings, no false negatives"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(
+            int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self.hash_count = max(round(self.size / self.capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        # double hashing: h1 + i * h2 gives k independent enough positions
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationList:
+    """Revoked token ids kept in memory until the token would expire anyway
+
+    revoked_tokens is the source of truth. Every worker loads it at startup and
+    then pulls rows added by other workers every `sync_interval` seconds, so a
+    logout on one worker reaches the others within that interval. Lookups only
+    touch the Bloom filter, and the hash set on the rare positive.
+
+    Syncs go by created_at, not id: ids are handed out before commit, so a
+    row can become visible after one with a higher id. Each sync re-reads the
+    last `sync_overlap` seconds and skips jtis it already holds.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        sync_interval: float = TOKEN_REVOCATION_SYNC_INTERVAL,
+        sync_overlap: float = TOKEN_REVOCATION_SYNC_OVERLAP,
+        capacity: int = TOKEN_REVOCATION_BLOOM_CAPACITY,
+        error_rate: float = TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    ):
+        self.session_factory = session_factory
+        self.sync_interval = sync_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self.error_rate = error_rate
+        self._expiry: Dict[str, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_seen: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._counters = {"checks": 0, "bloom_positives": 0, "revoked_hits": 0}
+
+    def is_revoked(self, jti: str) -> bool:
+        self._counters["checks"] += 1
+        if jti not in self._bloom:
+            return False
+        self._counters["bloom_positives"] += 1
+        expires = self._expiry.get(jti)
+        if expires is None or expires <= time.time():
+            return False
+        self._counters["revoked_hits"] += 1
+        return True
+
+    def add(self, jti: str, expires: float) -> None:
+        with self._lock:
+            self._expiry[jti] = expires
+            if len(self._expiry) > self._bloom.capacity:
+                self._rebuild(self._bloom.capacity * 2)
+            else:
+                self._bloom.add(jti)
+
+    def _rebuild(self, capacity: int) -> None:
+        """Drop expired ids, Bloom filters cannot delete so start a new one"""
+        now = time.time()
+        self._expiry = {
+            jti: expires for jti, expires in self._expiry.items() if expires > now
+        }
+        bloom = BloomFilter(max(capacity, len(self._expiry) * 2), self.error_rate)
+        for jti in self._expiry:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def revoke(
+        self,
+        db: Session,
+        jti: str,
+        expires_at: datetime,
+        user_id: Optional[int] = None,
+        token_type: str = "access",
+    ) -> bool:
+        """Persist and apply a revocation, False if `jti` was already revoked"""
+        db.add(
+            RevokedToken(
+                jti=jti, user_id=user_id, token_type=token_type, expires_at=expires_at
+            )
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        self.add(jti, expires_at.timestamp())
+        return True
+
+    def sync(self) -> None:
+        """Load revocations written since the last sync and drop expired ones"""
+        now = datetime.now(timezone.utc)
+        db = self.session_factory()
+        try:
+            query = select(
+                RevokedToken.jti, RevokedToken.expires_at, RevokedToken.created_at
+            )
+            if self._last_seen is not None:
+                query = query.where(
+                    RevokedToken.created_at >= self._last_seen - self.sync_overlap
+                )
+            rows = db.execute(query).all()
+            db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+            db.commit()
+        finally:
+            db.close()
+
+        for row in rows:
+            # created_at comes from the database clock, never compared to ours
+            if self._last_seen is None or row.created_at > self._last_seen:
+                self._last_seen = row.created_at
+            expires = _utc(row.expires_at).timestamp()
+            if row.jti in self._expiry or expires <= now.timestamp():
+                continue
+            self.add(row.jti, expires)
+        with self._lock:
+            if any(expires <= now.timestamp() for expires in self._expiry.values()):
+                self._rebuild(self._bloom.capacity)
+
+    def start(self) -> None:
+        try:
+            self.sync()
+        except Exception:
+            logger.exception("Initial token revocation sync failed")
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="token-revocation-sync", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Token revocation sync failed")
+
+    def stats(self) -> Dict:
+        return {
+            "revoked": len(self._expiry),
+            "bloom_capacity": self._bloom.capacity,
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hash_count,
+            "last_synced_at": self._last_seen and self._last_seen.isoformat(),
+            **self._counters,
+        }
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,206 @@
+import abc
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+from decouple import config
+from fastapi import HTTPException, Request, status
+
+# requests per minute refill and bucket size (burst) of each limiter
+LOGIN_IP_RATE = config("LOGIN_IP_RATE", default=20, cast=float)
+LOGIN_IP_BURST = config("LOGIN_IP_BURST", default=10, cast=int)
+LOGIN_USERNAME_RATE = config("LOGIN_USERNAME_RATE", default=5, cast=float)
+LOGIN_USERNAME_BURST = config("LOGIN_USERNAME_BURST", default=5, cast=int)
+REGISTER_IP_RATE = config("REGISTER_IP_RATE", default=5, cast=float)
+REGISTER_IP_BURST = config("REGISTER_IP_BURST", default=5, cast=int)
+
+# "memory" keeps buckets per worker, "redis" shares them between workers
+THROTTLE_BACKEND = config("THROTTLE_BACKEND", default="memory")
+THROTTLE_REDIS_URL = config("THROTTLE_REDIS_URL", default="redis://localhost:6379/0")
+THROTTLE_MAX_KEYS = config("THROTTLE_MAX_KEYS", default=100000, cast=int)
+THROTTLE_EVICT_INTERVAL = config("THROTTLE_EVICT_INTERVAL", default=60, cast=float)
+
+
+class ThrottleBackend(abc.ABC):
+    """Token bucket storage, subclass it to share buckets between workers"""
+
+    @abc.abstractmethod
+    def consume(self, key: str, rate: float, capacity: int) -> float:
+        """Take one token from `key`'s bucket
+
+        `rate` is in tokens per second. Returns 0 when a token was taken,
+        otherwise the seconds until one is available.
+        """
+
+    def stats(self) -> Dict:
+        return {}
+
+
+class MemoryThrottleBackend(ThrottleBackend):
+    """Buckets in an OrderedDict of key -> [tokens, updated_at, refill_time]
+
+    Kept in least recently touched order, so past `max_keys` the oldest
+    bucket is dropped in O(1), which bounds memory and per-request cost under
+    an IP-spraying attack. Full buckets carry no information and are swept
+    every `evict_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        max_keys: int = THROTTLE_MAX_KEYS,
+        evict_interval: float = THROTTLE_EVICT_INTERVAL,
+    ):
+        self.max_keys = max_keys
+        self.evict_interval = evict_interval
+        # refill_time is capacity / rate, when an idle bucket is full again
+        self._buckets: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_eviction = time.monotonic() + evict_interval
+        self.evicted = 0
+
+    def consume(self, key: str, rate: float, capacity: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict_full(now)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(capacity), now, capacity / rate]
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._buckets.move_to_end(key)
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / rate
+
+    def _evict_full(self, now: float) -> None:
+        full = [
+            key
+            for key, (_, updated_at, refill_time) in self._buckets.items()
+            if now - updated_at >= refill_time
+        ]
+        for key in full:
+            del self._buckets[key]
+        self.evicted += len(full)
+        self._next_eviction = now + self.evict_interval
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "keys": len(self._buckets),
+                "max_keys": self.max_keys,
+                "evicted": self.evicted,
+            }
+
+
+class RedisThrottleBackend(ThrottleBackend):
+    """Buckets in Redis hashes, updated atomically by a Lua script
+
+    Needs the optional `redis` package (`pip install fast-api-blog[redis]`).
+    """
+
+    SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+    def __init__(self, url: str = THROTTLE_REDIS_URL, prefix: str = "throttle:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._consume = self._client.register_script(self.SCRIPT)
+
+    def consume(self, key: str, rate: float, capacity: int) -> float:
+        return float(self._consume(keys=[self.prefix + key], args=[rate, capacity]))
+
+    def stats(self) -> Dict:
+        return {"backend": "redis"}
+
+
+def get_backend(name: str = THROTTLE_BACKEND) -> ThrottleBackend:
+    if name == "memory":
+        return MemoryThrottleBackend()
+    if name == "redis":
+        return RedisThrottleBackend()
+    raise ValueError(f"Unknown throttle backend: {name}")
+
+
+throttle_backend = get_backend()
+
+
+class Throttle:
+    """A named token bucket limiter, `rate` is in requests per minute"""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        backend: ThrottleBackend = throttle_backend,
+    ):
+        self.name = name
+        self.rate = rate / 60
+        self.burst = burst
+        self.backend = backend
+        self.rejected = 0
+
+    def check(self, key: str) -> None:
+        """Raise 429 with Retry-After when `key` is out of tokens"""
+        retry_after = self.backend.consume(f"{self.name}:{key}", self.rate, self.burst)
+        if retry_after > 0:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+login_ip_throttle = Throttle("login:ip", LOGIN_IP_RATE, LOGIN_IP_BURST)
+login_username_throttle = Throttle(
+    "login:username", LOGIN_USERNAME_RATE, LOGIN_USERNAME_BURST
+)
+register_ip_throttle = Throttle("register:ip", REGISTER_IP_RATE, REGISTER_IP_BURST)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def throttle_stats() -> Dict:
+    return {
+        **throttle_backend.stats(),
+        "rejected": {
+            throttle.name: throttle.rejected
+            for throttle in (
+                login_ip_throttle,
+                login_username_throttle,
+                register_ip_throttle,
+            )
+        },
+    }
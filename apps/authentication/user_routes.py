@@ -74,12 +74,15 @@
 #         raise HTTPException(status_code=401, detail="Invalid username or password.")
 #     return {"message": "Login successful.", "username": db_user.username}
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from apps.database import get_db
-from base.pagination import paginate
+from apps.database import get_db, get_read_db
+from base.pagination import PaginationError, paginate
+from base.responses import error_json_response, success_json_response
 from base.route import StandardResponse
 
 from .models.models import User
@@ -134,27 +137,31 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 def get_users(
     page: int = 1,  # we are passing page and page_size in paginate() directly
     page_size: int = 1,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,  # keyset paging, empty for the first page
+    fields: Optional[str] = None,  # comma separated sparse fieldset
+    db: Session = Depends(get_read_db),
 ):
     """Get all users with pagination"""
-    result = paginate(
-        query=db.query(User),
-        page=page,  # we are passing page and page_size in paginate() directly
-        page_size=page_size,
-        schema=UserList,
-    )
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=StandardResponse.success_response(
-            data=result.data,
-            message="Users fetched successfully.",
-            meta=result.meta,
-        ).model_dump(),
+    try:
+        result = paginate(
+            query=db.query(User),
+            page=page,  # we are passing page and page_size in paginate() directly
+            page_size=page_size,
+            schema=UserList,
+            cursor=cursor,
+            fields=fields,
+        )
+    except PaginationError as exc:
+        return error_json_response(message=str(exc))
+    return success_json_response(
+        data=result.data,
+        message="Users fetched successfully.",
+        meta=result.meta,
     )
 
 
 @router.get("/retrieve/{user_id}", response_model=StandardResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_read_db)):
     """Get a specific user by ID"""
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -1,12 +1,124 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from decouple import config
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+# Argon2 cost, tuned per machine with `python -m apps.authentication.calibrate`.
+# Defaults are passlib's; memory cost is in KiB.
+ARGON2_TIME_COST = config("ARGON2_TIME_COST", default=3, cast=int)
+ARGON2_MEMORY_COST = config("ARGON2_MEMORY_COST", default=65536, cast=int)
+ARGON2_PARALLELISM = config("ARGON2_PARALLELISM", default=4, cast=int)
+
 # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto") only supports upto 72 bits of character]
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
 
+# Argon2 runs in its own processes so a login burst cannot hold the GIL and
+# starve the request threadpool. 0 workers hashes inline in the caller.
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+# hashes queued or running at once before new requests get a 503
+PASSWORD_HASH_MAX_PENDING = config(
+    "PASSWORD_HASH_MAX_PENDING", default=PASSWORD_HASH_WORKERS * 8, cast=int
+)
+PASSWORD_HASH_RETRY_AFTER = config("PASSWORD_HASH_RETRY_AFTER", default=1, cast=int)
 
-def hash_password(password: str) -> str:
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# admission and counters, updated from many request threads
+_stats_lock = threading.Lock()
+_stats = {"pending": 0, "submitted": 0, "rejected": 0}
+
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a process that already runs threads is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _run(fn, *args):
+    """Run `fn` in the hash pool and wait for it, or raise 503 when it is full"""
+    if PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+    with _stats_lock:
+        full = _stats["pending"] >= max(PASSWORD_HASH_MAX_PENDING, 1)
+        if full:
+            _stats["rejected"] += 1
+        else:
+            _stats["pending"] += 1
+            _stats["submitted"] += 1
+    if full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password operations in progress, retry later",
+            headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+        )
+    try:
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        with _stats_lock:
+            _stats["pending"] -= 1
+
+
+def hash_password(password: str) -> str:
+    return _run(_hash, password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _run(_verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password and return a new hash when its parameters are stale"""
+    return _run(_verify_and_update, plain_password, hashed_password)
+
+
+def start_hash_pool() -> None:
+    """Spawn the worker processes up front instead of on the first login"""
+    if PASSWORD_HASH_WORKERS > 0:
+        _get_executor()
+
+
+def shutdown_hash_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def hash_pool_stats() -> dict:
+    with _stats_lock:
+        return {
+            "workers": PASSWORD_HASH_WORKERS,
+            "max_pending": PASSWORD_HASH_MAX_PENDING,
+            **_stats,
+        }
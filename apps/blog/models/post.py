@@ -1,12 +1,109 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+import math
+import re
+
+from decouple import config
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, String, Text, event
+from sqlalchemy.orm import deferred, relationship, validates
 
 from base.models import BaseModel
 
+EXCERPT_LENGTH = config("EXCERPT_LENGTH", default=200, cast=int)
+WORDS_PER_MINUTE = config("WORDS_PER_MINUTE", default=200, cast=int)
+
+
+def content_stats(content) -> dict:
+    """excerpt, word_count and reading_time (minutes) stored alongside content"""
+    words = (content or "").split()
+    excerpt = " ".join(words)
+    if len(excerpt) > EXCERPT_LENGTH:
+        # cut on a word boundary when there is one
+        cut = excerpt.rfind(" ", 0, EXCERPT_LENGTH + 1)
+        excerpt = excerpt[: cut if cut > 0 else EXCERPT_LENGTH].rstrip() + "..."
+    return {
+        "excerpt": excerpt if content is not None else None,
+        "word_count": len(words),
+        "reading_time": math.ceil(len(words) / WORDS_PER_MINUTE),
+    }
+
 
 class Post(BaseModel):
     __tablename__ = "posts"
+    # an author's posts newest first, for profile keyset paging and counts
+    __table_args__ = (
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+    )
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), index=True)
-    content = Column(Text)
+    # unbounded, only loaded when asked for (undefer / load_only)
+    content = deferred(Column(Text))
+    # derived from content on every write, listings use these instead
+    # Text, so changing EXCERPT_LENGTH needs no migration
+    excerpt = Column(Text, nullable=True)
+    word_count = Column(Integer, nullable=False, default=0)
+    reading_time = Column(Integer, nullable=False, default=0)
     author = relationship("User", back_populates="posts")
+
+    @validates("content")
+    def _update_content_stats(self, key, content):
+        for field, value in content_stats(content).items():
+            setattr(self, field, value)
+        return content
+
+
+# Full-text search objects, queried with raw SQL in apps/blog/search.py and
+# left out of the mapping (and of alembic autogenerate, see alembic/env.py).
+# Title matches weigh more than content matches.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)",
+]
+
+# external content FTS5 table kept in sync with posts by triggers
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        Post.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Post.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Post.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite"),
+)
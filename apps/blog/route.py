@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from decouple import config
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 
 from apps.authentication.models.models import User
-from apps.database import get_db
+from apps.database import get_async_read_db, get_db, get_read_db
+from base.export import ExportFormat, export_response
+from base.pagination import CountMode, PaginationError, apaginate
+from base.responses import error_json_response, success_json_response
 from base.route import (
     CreateRouter,
     ReadRouter,
@@ -12,11 +23,21 @@ from base.route import (
     UpdateRouter,
 )
 
-from .models.post import Post
-from .schemas import PostCreate, PostList, PostRetrieve, PostUpdate
+from .models.post import Post, content_stats
+from .schemas import (
+    PostCreate,
+    PostExport,
+    PostList,
+    PostRetrieve,
+    PostSearchResult,
+    PostUpdate,
+)
+from .search import search_posts
 
 router = APIRouter()
 
+BULK_CREATE_MAX_ITEMS = config("BULK_CREATE_MAX_ITEMS", default=1000, cast=int)
+
 # create_router = CreateRouter(Post, PostCreate)
 # read_router = ReadRouter(Post, PostList)
 # retrieve_router = RetrieveRouter(Post, PostRetrieve)
@@ -76,12 +97,46 @@ class PostListRouter(ReadRouter[Post, PostList]):
     #     return StandardResponse(
     #         success=True, data=data, message="Posts fetched successfully."
     #     )
-    pass
+    async def read_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.exact,
+        fields: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_read_db),
+    ):
+        try:
+            result = await apaginate(
+                session=db,
+                statement=select(self.model),
+                page=page,
+                page_size=page_size,
+                schema=self.schema,
+                cursor=cursor,
+                count=count,
+                fields=fields,
+            )
+        except PaginationError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+        meta_dict = dict(result.meta)
+        meta_dict["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return success_json_response(
+            data=result.data,
+            message="Retrieved successfully",
+            meta=meta_dict,
+        )
 
 
 class PostRetrieveRouter(RetrieveRouter[Post, PostRetrieve]):
-    def retrieve(self, id: int, db: Session = Depends(get_db)):
-        db_item = db.query(self.model).filter(self.model.id == id).first()
+    def retrieve(self, id: int, db: Session = Depends(get_read_db)):
+        db_item = (
+            db.query(self.model)
+            .options(undefer(self.model.content))
+            .filter(self.model.id == id)
+            .first()
+        )
         if not db_item:
             raise HTTPException(status_code=404, detail="Post not found.")
         return StandardResponse(
@@ -120,3 +175,136 @@ post_routers = [
 
 for post_router in post_routers:
     router.include_router(post_router.router, prefix="/posts")
+
+
+@router.get("/posts/export")
+def export_posts(
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Stream posts created in [start, end) as NDJSON or CSV"""
+    query = db.query(Post).order_by(Post.created_at, Post.id)
+    if start is not None:
+        query = query.filter(Post.created_at >= start)
+    if end is not None:
+        query = query.filter(Post.created_at < end)
+    return export_response(
+        query=query, schema=PostExport, format=format, filename="posts"
+    )
+
+
+@router.get("/posts/search")
+def search(
+    q: str,
+    page: int = 1,
+    page_size: int = 10,
+    db: Session = Depends(get_read_db),
+):
+    """Full-text search over post titles and content, best matches first"""
+    if not q.strip() or page < 1 or not 1 <= page_size <= 100:
+        return error_json_response(
+            message="q is required, page must be >= 1 and page_size 1-100."
+        )
+    rows = search_posts(db, q, limit=page_size + 1, offset=(page - 1) * page_size)
+    has_next = len(rows) > page_size
+    return success_json_response(
+        data=[PostSearchResult.model_validate(row) for row in rows[:page_size]],
+        message="Posts searched successfully.",
+        meta={
+            "page": page,
+            "page_size": page_size,
+            "previous_page": page - 1 if page > 1 else None,
+            "next_page": page + 1 if has_next else None,
+        },
+    )
+
+
+def _insert_posts(db: Session, rows: List[Dict], indexes: List[int]):
+    """Insert `rows` and return (created, errors) keyed by request index
+
+    One row the database rejects must not cost the whole batch, so a failed
+    batch is retried row by row.
+    """
+    try:
+        # ordered RETURNING pairs each new row with its request index
+        posts = db.scalars(
+            insert(Post).returning(Post, sort_by_parameter_order=True), rows
+        ).all()
+        # serialize before commit expires the objects and reloads each one
+        created = [
+            {
+                "index": index,
+                "id": post.id,
+                # content is deferred, echo it from the request instead
+                **PostRetrieve.model_validate(row).model_dump(),
+            }
+            for index, row, post in zip(indexes, rows, posts)
+        ]
+        db.commit()
+        return created, []
+    except DBAPIError as exc:
+        db.rollback()
+        if len(rows) == 1:
+            message = f"Post could not be created: {exc.orig}"
+            return [], [{"index": indexes[0], "message": message}]
+    created, errors = [], []
+    for index, row in zip(indexes, rows):
+        row_created, row_errors = _insert_posts(db, [row], [index])
+        created.extend(row_created)
+        errors.extend(row_errors)
+    return created, errors
+
+
+@router.post("/posts/bulk-create")
+def bulk_create_posts(
+    # not List[Dict], one non-object item would reject the whole batch
+    items: List[Any] = Body(...),
+    db: Session = Depends(get_db),
+):
+    """Create many posts at once, invalid items are reported and skipped
+
+    Items are validated one by one so a bad item does not fail the batch,
+    authors are checked with one IN query and all valid posts are written
+    with a single multi-row INSERT ... RETURNING, row by row only when the
+    database rejects the batch.
+    """
+    if not items or len(items) > BULK_CREATE_MAX_ITEMS:
+        return error_json_response(
+            message=f"Send between 1 and {BULK_CREATE_MAX_ITEMS} posts."
+        )
+
+    errors = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, PostCreate.model_validate(item)))
+        except ValidationError as exc:
+            errors.append({"index": index, "message": str(exc.errors()[0]["msg"])})
+
+    author_ids = {post.author_id for _, post in valid}
+    existing_authors = set(
+        db.scalars(select(User.id).where(User.id.in_(author_ids))) if author_ids else ()
+    )
+    rows = []
+    indexes = []
+    for index, post in valid:
+        if post.author_id not in existing_authors:
+            errors.append({"index": index, "message": "Author not found."})
+            continue
+        # bulk INSERT skips @validates, fill the derived columns here
+        rows.append({**post.model_dump(), **content_stats(post.content)})
+        indexes.append(index)
+
+    created = []
+    if rows:
+        created, failed = _insert_posts(db, rows, indexes)
+        errors.extend(failed)
+
+    errors.sort(key=lambda error: error["index"])
+    return success_json_response(
+        data={"created": created, "errors": errors},
+        message=f"{len(created)} posts created, {len(errors)} failed.",
+        status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+    )
@@ -1,19 +1,43 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class PostCreate(BaseModel):
-    title: str
+    # posts.title is String(255)
+    title: str = Field(max_length=255)
     content: str
     author_id: int
 
 
 class PostList(BaseModel):
     title: str
-    content: str
+    # content: str
+    excerpt: Optional[str]
+    word_count: int
+    reading_time: int
     author_id: int
     model_config = ConfigDict(from_attributes=True)
 
 
+class PostSummary(BaseModel):
+    id: int
+    title: str
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostSearchResult(BaseModel):
+    id: int
+    title: str
+    author_id: int
+    created_at: datetime
+    rank: float
+    title_highlight: str
+    snippet: str
+
+
 class PostRetrieve(BaseModel):
     title: str
     content: str
@@ -21,7 +45,17 @@ class PostRetrieve(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class PostUpdate(BaseModel):
+class PostExport(BaseModel):
+    # id and created_at let consumers dedupe and resume time-ranged exports
+    id: int
     title: str
     content: str
     author_id: int
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostUpdate(BaseModel):
+    title: str = Field(max_length=255)
+    content: str
+    author_id: int
@@ -0,0 +1,131 @@
+import html
+import re
+from typing import List
+
+from sqlalchemy import and_, or_, select, text
+from sqlalchemy.orm import Session
+
+from .models.post import Post
+
+# control characters mark matches so the text can be HTML escaped first
+_START, _STOP = "\x02", "\x03"
+
+_POSTGRES_SEARCH = text(
+    """
+    SELECT p.id, p.title, p.author_id, p.created_at, hits.rank,
+        ts_headline('english', coalesce(p.title, ''), hits.query,
+            'StartSel=' || :start || ', StopSel=' || :stop || ', HighlightAll=true')
+            AS title_highlight,
+        ts_headline('english', coalesce(p.content, ''), hits.query,
+            'StartSel=' || :start || ', StopSel=' || :stop
+            || ', MaxFragments=2, MaxWords=30, MinWords=10')
+            AS snippet
+    FROM (
+        SELECT posts.id, query, ts_rank_cd(search_vector, query) AS rank
+        FROM posts, websearch_to_tsquery('english', :q) AS query
+        WHERE search_vector @@ query
+        ORDER BY rank DESC, posts.id DESC
+        LIMIT :limit OFFSET :offset
+    ) AS hits
+    JOIN posts p ON p.id = hits.id
+    ORDER BY hits.rank DESC, p.id DESC
+    """
+)
+
+# bm25() is lower for better matches, title weighted 2x like the tsvector
+_SQLITE_SEARCH = text(
+    """
+    SELECT p.id, p.title, p.author_id, p.created_at,
+        -bm25(posts_fts, 2.0, 1.0) AS rank,
+        highlight(posts_fts, 0, :start, :stop) AS title_highlight,
+        snippet(posts_fts, 1, :start, :stop, '...', 30) AS snippet
+    FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid
+    WHERE posts_fts MATCH :q
+    ORDER BY bm25(posts_fts, 2.0, 1.0), p.id DESC
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+
+def _fts5_query(q: str) -> str:
+    """Quote every word so user input is never parsed as FTS5 syntax"""
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in q.split())
+
+
+def _highlight(value) -> str:
+    return html.escape(value or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def _like_pattern(word: str) -> str:
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _mark(value, words: List[str]):
+    if not value:
+        return value
+    pattern = "|".join(re.escape(word) for word in words)
+    return re.sub(pattern, lambda match: _START + match[0] + _STOP, value, flags=re.I)
+
+
+def _like_search(db: Session, q: str, limit: int, offset: int) -> List[dict]:
+    """Unranked fallback for databases without a full-text setup, newest first
+
+    Every word must appear in the title or content. This scans posts, so it
+    only keeps search working, it is not meant for large tables.
+    """
+    words = q.split()
+    conditions = [
+        or_(
+            Post.title.ilike(_like_pattern(word), escape="\\"),
+            Post.content.ilike(_like_pattern(word), escape="\\"),
+        )
+        for word in words
+    ]
+    rows = db.execute(
+        select(Post.id, Post.title, Post.author_id, Post.created_at, Post.excerpt)
+        .where(and_(*conditions))
+        .order_by(Post.id.desc())
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    return [
+        {
+            "id": row.id,
+            "title": row.title,
+            "author_id": row.author_id,
+            "created_at": row.created_at,
+            "rank": 0.0,
+            "title_highlight": _highlight(_mark(row.title, words)),
+            "snippet": _highlight(_mark(row.excerpt, words)),
+        }
+        for row in rows
+    ]
+
+
+def search_posts(db: Session, q: str, limit: int, offset: int = 0) -> List[dict]:
+    """Ranked full-text matches on post title and content, best first
+
+    Highlights are HTML escaped with matches wrapped in <mark>. Databases
+    other than PostgreSQL and SQLite get an unranked LIKE search.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement, query = _POSTGRES_SEARCH, q
+    elif dialect == "sqlite":
+        statement, query = _SQLITE_SEARCH, _fts5_query(q)
+    else:
+        return _like_search(db, q, limit, offset)
+
+    rows = db.execute(
+        statement,
+        {"q": query, "limit": limit, "offset": offset, "start": _START, "stop": _STOP},
+    ).mappings()
+    return [
+        {
+            **row,
+            "title_highlight": _highlight(row["title_highlight"]),
+            "snippet": _highlight(row["snippet"]),
+        }
+        for row in rows
+    ]
@@ -1,9 +1,155 @@
-from decouple import config
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from decouple import Csv, config
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-engine = create_engine(config("DATABASE_URL_"), future=True)
+from apps.diagnostics.pool import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    instrument_engine,
+)
+from apps.diagnostics.queries import instrument_queries
+
+# sync driver -> async driver used when ASYNC_DATABASE_URL_ is not set
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync DBAPI driver of a database URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+DATABASE_URL = config("DATABASE_URL_")
+ASYNC_DATABASE_URL = config("ASYNC_DATABASE_URL_", default=to_async_url(DATABASE_URL))
+
+# Connection pool sizing, applied per engine and per worker process
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=5, cast=int)
+DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=10, cast=int)
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=30, cast=float)
+DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=1800, cast=int)
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=False, cast=bool)
+
+# Read replicas used by get_read_db()/get_async_read_db(), comma separated
+DATABASE_REPLICA_URLS = config("DATABASE_REPLICA_URLS_", default="", cast=Csv())
+DB_REPLICA_STRATEGY = config("DB_REPLICA_STRATEGY", default="round_robin")
+DB_REPLICA_RETRY_AFTER = config("DB_REPLICA_RETRY_AFTER", default=30, cast=float)
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Pool keyword arguments for create_engine()/create_async_engine()"""
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+    # SQLite picks its own pool class (e.g. SingletonThreadPool for :memory:)
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+
+engine = create_engine(DATABASE_URL, future=True, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine, "primary")
+instrument_queries(engine)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True)
+)
+instrument_engine(async_engine, "primary_async")
+instrument_queries(async_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+class ReplicaSelector:
+    """Pick a read replica engine, skipping replicas that recently failed
+
+    `strategy` is either "round_robin" or "least_connections" (fewest
+    checked-out connections in the replica's pool).
+    """
+
+    def __init__(self, engines, strategy: str = "round_robin", retry_after=30.0):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.engines = list(engines)
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def candidates(self) -> list:
+        """Healthy replicas in the order they should be tried"""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                engine
+                for engine in self.engines
+                if self._down_until.get(engine, 0) <= now
+            ]
+        if not healthy:
+            return []
+        if self.strategy == "least_connections":
+            return sorted(healthy, key=_checked_out)
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, engine) -> None:
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + self.retry_after
+
+
+def _checked_out(engine) -> int:
+    pool = getattr(engine, "sync_engine", engine).pool
+    checkedout = getattr(pool, "checkedout", None)
+    return checkedout() if callable(checkedout) else 0
+
+
+replica_engines = []
+async_replica_engines = []
+for index, replica_url in enumerate(DATABASE_REPLICA_URLS):
+    replica_engine = create_engine(
+        replica_url, future=True, **engine_options(replica_url)
+    )
+    instrument_engine(replica_engine, f"replica_{index}")
+    instrument_queries(replica_engine)
+    replica_engines.append(replica_engine)
+
+    async_replica_url = to_async_url(replica_url)
+    async_replica_engine = create_async_engine(
+        async_replica_url, **engine_options(async_replica_url, is_async=True)
+    )
+    instrument_engine(async_replica_engine, f"replica_{index}_async")
+    instrument_queries(async_replica_engine)
+    async_replica_engines.append(async_replica_engine)
+
+replica_selector = ReplicaSelector(
+    replica_engines, DB_REPLICA_STRATEGY, DB_REPLICA_RETRY_AFTER
+)
+async_replica_selector = ReplicaSelector(
+    async_replica_engines, DB_REPLICA_STRATEGY, DB_REPLICA_RETRY_AFTER
+)
+
 Base = declarative_base()
 
 
@@ -13,3 +159,70 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def read_session():
+    """Session for read-only work, bound to a replica when one is healthy
+
+    Falls back to the primary when no replica is configured or all of them
+    fail to hand out a connection, either because they are unreachable
+    (marked down for DB_REPLICA_RETRY_AFTER) or because their pool is
+    exhausted. Probing a replica checks out a connection,
+    so open it only once the database is actually needed. Never use it for
+    writes.
+    """
+    db = None
+    for replica in replica_selector.candidates():
+        db = SessionLocal(bind=replica)
+        try:
+            db.connection()
+            break
+        except PoolTimeoutError:
+            # the replica is up, its pool is exhausted: try the next one
+            db.close()
+            db = None
+        except DBAPIError:
+            db.close()
+            db = None
+            replica_selector.mark_down(replica)
+    if db is None:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """Dependency form of read_session() for read-only endpoints"""
+    with read_session() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """Async counterpart of get_read_db()"""
+    db = None
+    for replica in async_replica_selector.candidates():
+        db = AsyncSessionLocal(bind=replica)
+        try:
+            await db.connection()
+            break
+        except PoolTimeoutError:
+            await db.close()
+            db = None
+        except DBAPIError:
+            await db.close()
+            db = None
+            async_replica_selector.mark_down(replica)
+    if db is None:
+        db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,42 @@
+from starlette.datastructures import MutableHeaders
+
+from .queries import QueryStats, current_query_stats, n_plus_one_logger
+
+
+class QueryStatsMiddleware:
+    """Expose per-request SQL statement count and time as response headers
+
+    Adds `X-DB-Queries` and `X-DB-Time-ms`, and logs statements repeated often
+    enough within one request to look like an N+1 pattern.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Queries", str(stats.count))
+                headers.append("X-DB-Time-ms", f"{stats.time_ms:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            for statement, count in stats.n_plus_one_suspects():
+                n_plus_one_logger.warning(
+                    "Possible N+1 on %s %s: statement executed %d times: %s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    statement,
+                )
@@ -0,0 +1,138 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# upper bounds (ms) of the checkout wait histogram buckets, last bucket is +Inf
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Counters for one connection pool, fed from SQLAlchemy pool events"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_failures = 0
+        self.wait_count = 0
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def observe_wait(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum_ms += elapsed_ms
+            self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+            self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+
+    def snapshot(self, pool) -> Dict:
+        with self._lock:
+            buckets = {
+                f"le_{bound}ms": count
+                for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            buckets["le_inf"] = self.wait_buckets[-1]
+            data = {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checkout_failures": self.checkout_failures,
+                "wait_ms": {
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum_ms, 3),
+                    "max": round(self.wait_max_ms, 3),
+                    "buckets": buckets,
+                },
+            }
+        # only QueuePool and its subclasses expose sizing information
+        for key in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, key, None)
+            if callable(method):
+                data[key] = method()
+        return data
+
+
+class TimedCheckoutMixin:
+    """Time how long callers wait for a connection and count failed checkouts"""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.incr("checkout_failures")
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool, keep feeding the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+pool_metrics: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, object] = {}
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """Register pool event listeners for a sync or async engine under `name`"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = PoolMetrics(name)
+    pool_metrics[name] = metrics
+    _engines[name] = sync_engine
+
+    if isinstance(sync_engine.pool, TimedCheckoutMixin):
+        sync_engine.pool.metrics = metrics
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    return metrics
+
+
+def pool_snapshots() -> list[Dict]:
+    return [
+        metrics.snapshot(_engines[name].pool) for name, metrics in pool_metrics.items()
+    ]
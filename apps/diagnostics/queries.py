@@ -0,0 +1,74 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from decouple import config
+from sqlalchemy import event
+
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=200, cast=float)
+N_PLUS_ONE_THRESHOLD = config("N_PLUS_ONE_THRESHOLD", default=5, cast=int)
+
+slow_query_logger = logging.getLogger("apps.db.slow_query")
+n_plus_one_logger = logging.getLogger("apps.db.n_plus_one")
+
+
+class QueryStats:
+    """SQL statements issued while handling a single request"""
+
+    __slots__ = ("count", "time_ms", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.time_ms = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.time_ms += elapsed_ms
+        self.statements[statement] += 1
+
+    def n_plus_one_suspects(
+        self, threshold: int = N_PLUS_ONE_THRESHOLD
+    ) -> List[Tuple[str, int]]:
+        """Identical statements executed at least `threshold` times"""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def instrument_queries(engine) -> None:
+    """Count and time every statement on `engine` and log the slow ones"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+
+        if elapsed_ms >= SLOW_QUERY_MS:
+            slow_query_logger.warning(
+                "Slow query (%.1f ms): %s | parameters: %.1000r",
+                elapsed_ms,
+                statement,
+                parameters,
+            )
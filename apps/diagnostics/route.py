@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+
+from apps.api_logs.writer import log_writer
+from apps.authentication.authentication import get_current_superuser
+from apps.authentication.cache import user_cache
+from apps.authentication.revocation import revocation_list
+from apps.authentication.throttling import throttle_stats
+from apps.authentication.utils import hash_pool_stats
+from apps.stock.quotes import quote_cache
+from base.route import StandardResponse
+
+from .pool import pool_snapshots
+
+# internal counters and sizing, for superusers only
+router = APIRouter(dependencies=[Depends(get_current_superuser)])
+
+
+@router.get("/pool", response_model=StandardResponse)
+def pool_status():
+    """Connection pool usage, checkout wait histogram and failures per engine"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=StandardResponse.success_response(
+            data=pool_snapshots(),
+            message="Pool metrics fetched successfully.",
+        ).model_dump(),
+    )
+
+
+@router.get("/log-writer", response_model=StandardResponse)
+def log_writer_status():
+    """Queue depth and written/dropped/failed counters of the api log writer"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=StandardResponse.success_response(
+            data=log_writer.stats(),
+            message="Log writer stats fetched successfully.",
+        ).model_dump(),
+    )
+
+
+@router.get("/user-cache", response_model=StandardResponse)
+def user_cache_status():
+    """Size and hit/miss/eviction counters of the authenticated-user cache"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=StandardResponse.success_response(
+            data=user_cache.stats(),
+            message="User cache stats fetched successfully.",
+        ).model_dump(),
+    )
+
+
+@router.get("/password-hashing", response_model=StandardResponse)
+def password_hashing_status():
+    """Argon2 worker pool size, in-flight operations and 503 rejections"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=StandardResponse.success_response(
+            data=hash_pool_stats(),
+            message="Password hashing stats fetched successfully.",
+        ).model_dump(),
+    )
+
+
+@router.get("/token-revocation", response_model=StandardResponse)
+def token_revocation_status():
+    """Revoked token count, Bloom filter sizing and lookup counters"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=StandardResponse.success_response(
+            data=revocation_list.stats(),
+            message="Token revocation stats fetched successfully.",
+        ).model_dump(),
+    )
+
+
+@router.get("/throttling", response_model=StandardResponse)
+def throttling_status():
+    """Tracked limiter keys and 429 rejections per login/register limiter"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=StandardResponse.success_response(
+            data=throttle_stats(),
+            message="Throttling stats fetched successfully.",
+        ).model_dump(),
+    )
+
+
+@router.get("/quote-cache", response_model=StandardResponse)
+def quote_cache_status():
+    """Cached symbols, hit/miss counters and the invalidation bus in use"""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=StandardResponse.success_response(
+            data=quote_cache.stats(),
+            message="Quote cache stats fetched successfully.",
+        ).model_dump(),
+    )
@@ -0,0 +1,103 @@
+import enum
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .models import StockHistory
+
+
+class BarInterval(str, enum.Enum):
+    minute = "1m"
+    hour = "1h"
+    day = "1d"
+
+
+BAR_STEPS = {
+    BarInterval.minute: timedelta(minutes=1),
+    BarInterval.hour: timedelta(hours=1),
+    BarInterval.day: timedelta(days=1),
+}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# date_trunc() field on PostgreSQL, strftime() format on SQLite
+POSTGRES_UNITS = {
+    BarInterval.minute: "minute",
+    BarInterval.hour: "hour",
+    BarInterval.day: "day",
+}
+SQLITE_FORMATS = {
+    BarInterval.minute: "%Y-%m-%dT%H:%M:00",
+    BarInterval.hour: "%Y-%m-%dT%H:00:00",
+    BarInterval.day: "%Y-%m-%dT00:00:00",
+}
+
+
+def _bucket(dialect: str, interval: BarInterval):
+    if dialect == "postgresql":
+        return func.date_trunc(POSTGRES_UNITS[interval], StockHistory.created_at)
+    if dialect == "sqlite":
+        return func.strftime(SQLITE_FORMATS[interval], StockHistory.created_at)
+    raise NotImplementedError(f"Bars are not implemented for {dialect}")
+
+
+def _window_start(end: datetime, interval: BarInterval, max_bars: int) -> datetime:
+    """Start of the last `max_bars` buckets before `end`, on a bucket boundary"""
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    step = BAR_STEPS[interval]
+    # end rounded up to a boundary, so a bucket it cuts short still counts
+    boundary = _EPOCH - (_EPOCH - end) // step * step
+    return boundary - max_bars * step
+
+
+def stock_bars(
+    db: Session,
+    stock_id: int,
+    interval: BarInterval,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_bars: int = 1000,
+) -> List[dict]:
+    """OHLC bars of a stock's ticks in [start, end), oldest first
+
+    Open/close come from first_value/last_value over each bucket ordered by
+    (created_at, id), so the whole aggregation runs in the database and only
+    one row per bar is returned. Without `start` the bars of the last
+    `max_bars` intervals before `end` (or now) are returned, and the ticks
+    are bounded to them so the window functions do not scan the whole
+    history.
+    """
+    if start is None:
+        start = _window_start(end or datetime.now(timezone.utc), interval, max_bars)
+    bucket = _bucket(db.get_bind().dialect.name, interval).label("bucket")
+    in_bucket = dict(
+        partition_by=bucket,
+        order_by=(StockHistory.created_at, StockHistory.id),
+        rows=(None, None),
+    )
+    ticks = select(
+        bucket,
+        StockHistory.price,
+        func.first_value(StockHistory.price).over(**in_bucket).label("open"),
+        func.last_value(StockHistory.price).over(**in_bucket).label("close"),
+    ).where(StockHistory.stock_id == stock_id, StockHistory.created_at >= start)
+    if end is not None:
+        ticks = ticks.where(StockHistory.created_at < end)
+    ticks = ticks.subquery()
+
+    rows = db.execute(
+        select(
+            ticks.c.bucket.label("time"),
+            func.min(ticks.c.open).label("open"),
+            func.max(ticks.c.price).label("high"),
+            func.min(ticks.c.price).label("low"),
+            func.min(ticks.c.close).label("close"),
+            func.count().label("count"),
+        )
+        .group_by(ticks.c.bucket)
+        .order_by(ticks.c.bucket.desc())
+        .limit(max_bars)
+    ).mappings()
+    return list(reversed([dict(row) for row in rows]))
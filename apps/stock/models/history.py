@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from base.models import BaseModel
@@ -6,6 +6,12 @@ from base.models import BaseModel
 
 class StockHistory(BaseModel):
     __tablename__ = "stock_history"
+    # one stock's ticks in time order, for bounded history windows and bars
+    __table_args__ = (
+        Index(
+            "ix_stock_history_stock_id_created_at_id", "stock_id", "created_at", "id"
+        ),
+    )
     stock_id = Column(
         Integer,
         ForeignKey("stocks.id"),
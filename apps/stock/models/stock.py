@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.schema import UniqueConstraint
 
@@ -26,9 +26,9 @@ class Stock(BaseModel):
         nullable=False,
     )
     last_updated = Column(
-        String(50),
+        DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now().isoformat(),
+        default=lambda: datetime.now(timezone.utc),
     )
 
     history = relationship("StockHistory", back_populates="stock")
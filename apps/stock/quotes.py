@@ -0,0 +1,320 @@
+import json
+import logging
+import os
+import select as select_module
+import threading
+import uuid
+from dataclasses import astuple, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+from decouple import config
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from apps.database import SessionLocal, engine
+
+from .models import Stock
+
+# "local" only updates this worker, "postgres" also tells the other workers
+# through LISTEN/NOTIFY, "auto" picks postgres when the database is PostgreSQL
+QUOTE_BUS = config("QUOTE_BUS", default="auto")
+QUOTE_CHANNEL = config("QUOTE_CHANNEL", default="stock_quotes")
+# NOTIFY payloads are limited to 8000 bytes, send quotes in chunks
+QUOTE_NOTIFY_CHUNK = 50
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    id: int
+    symbol: str
+    price: int
+    last_updated: datetime
+
+
+def _as_aware(value: datetime) -> datetime:
+    """last_updated as an aware datetime, naive and aware ones do not compare
+
+    SQLite hands the column back naive (it holds UTC), PostgreSQL aware.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class QuoteCache:
+    """Latest quote of every stock keyed by symbol
+
+    Warmed with all stocks at startup, so on a warm cache a miss means the
+    symbol does not exist and lookups never reach the database.
+
+    Changes can arrive out of commit order (two workers updating one stock),
+    so a quote older than the cached one, by last_updated, is ignored.
+    """
+
+    def __init__(self):
+        self._quotes: Dict[str, Quote] = {}
+        self._lock = threading.Lock()
+        # changes applied while load() runs, replayed over its snapshot
+        self._during_load: Optional[List] = None
+        self.warm = False
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def load(self, db: Session) -> None:
+        """Replace the cache with all stocks
+
+        Start the bus before loading: changes committed after the snapshot
+        was read come in through apply() and are replayed on top of it.
+        """
+        with self._lock:
+            self._during_load = []
+        try:
+            rows = db.execute(
+                select(Stock.id, Stock.symbol, Stock.price, Stock.last_updated)
+            ).all()
+        except Exception:
+            with self._lock:
+                self._during_load = None
+            raise
+        quotes = {row.symbol: Quote(*row) for row in rows}
+        with self._lock:
+            for changed, removed in self._during_load:
+                self._merge(quotes, changed, removed)
+            self._during_load = None
+            self._quotes = quotes
+            self.warm = True
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        quote = self._quotes.get(symbol)
+        if quote is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return quote
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Quote]:
+        quotes = self._quotes
+        symbols = list(symbols)
+        found = {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+        self.hits += len(found)
+        self.misses += len(symbols) - len(found)
+        return found
+
+    def apply(self, quotes: Iterable[Quote] = (), removed: Iterable[str] = ()):
+        quotes, removed = list(quotes), list(removed)
+        with self._lock:
+            if self._during_load is not None:
+                self._during_load.append((quotes, removed))
+            self._merge(self._quotes, quotes, removed)
+
+    def _merge(self, target: Dict[str, Quote], quotes, removed) -> None:
+        for symbol in removed:
+            target.pop(symbol, None)
+        for quote in quotes:
+            cached = target.get(quote.symbol)
+            if cached is not None and (
+                _as_aware(quote.last_updated) < _as_aware(cached.last_updated)
+            ):
+                self.stale += 1
+                continue
+            target[quote.symbol] = quote
+
+    def stats(self) -> Dict:
+        return {
+            "warm": self.warm,
+            "symbols": len(self._quotes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "bus": type(quote_bus).__name__,
+        }
+
+
+class LocalQuoteBus:
+    """Delivers quote changes inside this process only, for tests/single worker"""
+
+    def __init__(self):
+        self._handlers: List[Callable] = []
+
+    def subscribe(self, handler: Callable) -> None:
+        self._handlers.append(handler)
+
+    def publish(self, quotes: List[Quote], removed: List[str]) -> None:
+        for handler in self._handlers:
+            handler(quotes, removed)
+
+    def start(self, timeout: float = 5.0) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class PostgresQuoteBus(LocalQuoteBus):
+    """Also NOTIFYs other workers, which LISTEN from a background thread
+
+    Payloads carry the quotes themselves, so receivers update their cache
+    without a query. After a lost listener connection the cache is reloaded
+    since notifications sent meanwhile are gone.
+    """
+
+    def __init__(self, channel: str = QUOTE_CHANNEL, on_reconnect=None):
+        super().__init__()
+        self.channel = channel
+        self.on_reconnect = on_reconnect
+        self.sender = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def publish(self, quotes: List[Quote], removed: List[str]) -> None:
+        super().publish(quotes, removed)
+        payloads = (
+            [{"sender": self.sender, "quotes": [], "removed": removed}]
+            if removed
+            else []
+        )
+        for start in range(0, len(quotes), QUOTE_NOTIFY_CHUNK):
+            chunk = quotes[start : start + QUOTE_NOTIFY_CHUNK]
+            payloads.append(
+                {
+                    "sender": self.sender,
+                    "quotes": [astuple(quote) for quote in chunk],
+                    "removed": [],
+                }
+            )
+        if not payloads:
+            return
+        try:
+            with engine.begin() as connection:
+                for payload in payloads:
+                    connection.execute(
+                        text("SELECT pg_notify(:channel, :payload)"),
+                        {
+                            "channel": self.channel,
+                            "payload": json.dumps(payload, default=datetime.isoformat),
+                        },
+                    )
+        except Exception:
+            logger.exception("Failed to publish %d quote changes", len(quotes))
+
+    def start(self, timeout: float = 5.0) -> None:
+        """Start the listener and wait until its LISTEN is in place"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._listening.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="quote-listener", daemon=True
+        )
+        self._thread.start()
+        if not self._listening.wait(timeout):
+            logger.warning("Quote listener not ready after %.1fs", timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _listen(self) -> None:
+        first = True
+        while not self._stop.is_set():
+            try:
+                connection = engine.raw_connection()
+                connection.detach()  # kept out of the pool for good
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                dbapi_connection.cursor().execute(f'LISTEN "{self.channel}"')
+                self._listening.set()
+                if not first and self.on_reconnect is not None:
+                    self.on_reconnect()
+                first = False
+                self._receive(dbapi_connection)
+            except Exception:
+                logger.exception("Quote listener failed, reconnecting")
+                self._stop.wait(1.0)
+
+    def _receive(self, dbapi_connection) -> None:
+        try:
+            while not self._stop.is_set():
+                if select_module.select([dbapi_connection], [], [], 1.0) == (
+                    [],
+                    [],
+                    [],
+                ):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    payload = json.loads(notify.payload)
+                    if payload["sender"] == self.sender:
+                        continue
+                    super().publish(
+                        [
+                            Quote(
+                                id, symbol, price, datetime.fromisoformat(last_updated)
+                            )
+                            for id, symbol, price, last_updated in payload["quotes"]
+                        ],
+                        payload["removed"],
+                    )
+        finally:
+            dbapi_connection.close()
+
+
+quote_cache = QuoteCache()
+
+
+def _reload() -> None:
+    db = SessionLocal()
+    try:
+        quote_cache.load(db)
+    finally:
+        db.close()
+
+
+def _make_bus():
+    bus = QUOTE_BUS
+    if bus == "auto":
+        bus = "postgres" if engine.dialect.name == "postgresql" else "local"
+    if bus == "postgres":
+        return PostgresQuoteBus(on_reconnect=_reload)
+    if bus == "local":
+        return LocalQuoteBus()
+    raise ValueError(f"Unknown quote bus: {QUOTE_BUS}")
+
+
+quote_bus = _make_bus()
+quote_bus.subscribe(quote_cache.apply)
+
+
+def start_quote_cache() -> None:
+    # LISTEN first, a change committed while loading would be missed otherwise
+    quote_bus.start()
+    try:
+        _reload()
+    except Exception:
+        logger.exception("Quote cache warm-up failed, falling back to the database")
+
+
+def stop_quote_cache() -> None:
+    quote_bus.stop()
+
+
+def publish_quotes(stocks: Iterable, removed: Iterable[str] = ()) -> None:
+    """Write-through after a commit: update this cache and tell other workers
+
+    `stocks` are Stock objects or rows with id/symbol/price/last_updated.
+    """
+    quote_bus.publish(
+        [
+            Quote(stock.id, stock.symbol, stock.price, stock.last_updated)
+            for stock in stocks
+        ],
+        list(removed),
+    )
@@ -1,45 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from decouple import config
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
+from sqlalchemy import case, insert, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
-from apps.database import get_db
-from base.pagination import paginate
+from apps.database import get_async_read_db, get_db, get_read_db, read_session
+from base.export import ExportFormat, export_response
+from base.pagination import PaginationError, apaginate, paginate
+from base.responses import error_json_response, success_json_response
 from base.route import StandardResponse
 
+from .bars import BarInterval, stock_bars
 from .models import Stock, StockHistory
+from .quotes import Quote, publish_quotes, quote_cache
 from .schema import (
+    BarSchema,
+    QuoteSchema,
     StockCreateSchema,
+    StockHistoryListSchema,
     StockHistoryRetrieveSchema,
     StockListSchema,
     StockRetrieveSchema,
     StockUpdateSchema,
+    TickSchema,
 )
 
 router = APIRouter()
 
+TICK_BATCH_MAX_SIZE = config("TICK_BATCH_MAX_SIZE", default=10000, cast=int)
+QUOTE_BATCH_MAX_SYMBOLS = config("QUOTE_BATCH_MAX_SYMBOLS", default=500, cast=int)
+
 
 @router.get("/list", response_model=StandardResponse)
 def list_stocks(
     page: int = 1,  # we are passing page and page_size in paginate() directly
     page_size: int = 1,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,  # keyset paging, empty for the first page
+    fields: Optional[str] = None,  # comma separated sparse fieldset
+    db: Session = Depends(get_read_db),
 ):
     """List all stocks"""
-    result = paginate(
-        query=db.query(Stock),
-        page=page,  # we are passing page and page_size in paginate() directly
-        page_size=page_size,
-        schema=StockListSchema,
-    )
+    try:
+        result = paginate(
+            query=db.query(Stock),
+            page=page,  # we are passing page and page_size in paginate() directly
+            page_size=page_size,
+            schema=StockListSchema,
+            cursor=cursor,
+            fields=fields,
+        )
+    except PaginationError as exc:
+        return error_json_response(message=str(exc))
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=StandardResponse.success_response(
-            data=result.data,
-            message="Stock fetched successfully.",
-            meta=result.meta,
-        ).model_dump(),
+    return success_json_response(
+        data=result.data,
+        message="Stock fetched successfully.",
+        meta=result.meta,
     )
 
 
@@ -49,7 +70,9 @@ def create_stock(
     db: Session = Depends(get_db),
 ):
     try:
-        db_stock = Stock(**stock.model_dump())
+        db_stock = Stock(**stock.model_dump(exclude={"last_updated"}))
+        if stock.last_updated is not None:
+            db_stock.last_updated = _as_utc(stock.last_updated)
         db.add(db_stock)
         db.flush()  # get ID, no commit yet
 
@@ -62,13 +85,14 @@ def create_stock(
 
         db.commit()
         db.refresh(db_stock)
+        publish_quotes([db_stock])
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
             content=StandardResponse.success_response(
                 data=StockRetrieveSchema.model_validate(db_stock),
                 message="Stock created successfully.",
-            ).model_dump(),
+            ).model_dump(mode="json"),
         )
 
     except IntegrityError:
@@ -111,18 +135,33 @@ def create_stock(
 #     )
 
 
+# @router.get("/retrieve/{stock_id}", response_model=StandardResponse)
+# async def retrieve_stock(
+#     stock_id: int,
+#     db: AsyncSession = Depends(get_async_read_db),
+# ):
+#     """Retrieve a stock by ID"""
+#     result = await db.execute(
+#         select(Stock).options(joinedload(Stock.history)).where(Stock.id == stock_id)
+#     )
+#     db_stock = result.unique().scalar_one_or_none()
+
+
 @router.get("/retrieve/{stock_id}", response_model=StandardResponse)
-def retrieve_stock(
+async def retrieve_stock(
     stock_id: int,
-    db: Session = Depends(get_db),
+    history_from: Optional[datetime] = Query(None, alias="from"),
+    history_to: Optional[datetime] = Query(None, alias="to"),
+    limit: int = 100,
+    cursor: str = "",  # history_meta.next_cursor, empty for the newest ticks
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """Retrieve a stock by ID"""
-    db_stock = (
-        db.query(Stock)
-        .options(joinedload(Stock.history))
-        .filter(Stock.id == stock_id)
-        .first()
-    )
+    """Retrieve a stock by ID with one window of its price history
+
+    History is a separate keyset query over [from, to), newest first, served
+    by the (stock_id, created_at, id) index.
+    """
+    db_stock = await db.get(Stock, stock_id)
 
     if not db_stock:
         return JSONResponse(
@@ -132,14 +171,29 @@ def retrieve_stock(
             ).model_dump(),
         )
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=StandardResponse.success_response(
-            data=StockHistoryRetrieveSchema.model_validate(db_stock).model_dump(
-                mode="json"
-            ),
-            message="Stock retrieved successfully.",
-        ).model_dump(),
+    statement = select(StockHistory).where(StockHistory.stock_id == stock_id)
+    if history_from is not None:
+        statement = statement.where(StockHistory.created_at >= history_from)
+    if history_to is not None:
+        statement = statement.where(StockHistory.created_at < history_to)
+    try:
+        history = await apaginate(
+            session=db,
+            statement=statement,
+            page_size=min(limit, 1000),
+            schema=StockHistoryListSchema,
+            cursor=cursor,
+        )
+    except PaginationError as exc:
+        return error_json_response(message=str(exc))
+
+    return success_json_response(
+        data={
+            **StockRetrieveSchema.model_validate(db_stock).model_dump(),
+            "history": history.data,
+            "history_meta": history.meta,
+        },
+        message="Stock retrieved successfully.",
     )
 
 
@@ -167,21 +221,29 @@ def update_stock(
             db.add(historical_price)
             db_stock.price = stock.price
 
+        old_symbol = db_stock.symbol
         if stock.symbol is not None:
             db_stock.symbol = stock.symbol
         if stock.company_name is not None:
             db_stock.company_name = stock.company_name
         if stock.last_updated is not None:
-            db_stock.last_updated = stock.last_updated
+            db_stock.last_updated = _as_utc(stock.last_updated)
+        elif stock.price is not None:
+            # quote caches drop changes older than the quote they hold
+            db_stock.last_updated = datetime.now(timezone.utc)
 
         db.commit()
         db.refresh(db_stock)
+        publish_quotes(
+            [db_stock],
+            removed=[old_symbol] if old_symbol != db_stock.symbol else [],
+        )
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content=StandardResponse.success_response(
                 data=StockRetrieveSchema.model_validate(db_stock),
                 message="Stock updated successfully.",
-            ).model_dump(),
+            ).model_dump(mode="json"),
         )
     except IntegrityError:
         db.rollback()
@@ -197,3 +259,221 @@ def update_stock(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to update stock: {str(e)}",
         )
+
+
+@router.get("/history/export")
+def export_stock_history(
+    stock_id: Optional[int] = None,
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Stream price history created in [start, end) as NDJSON or CSV"""
+    query = db.query(StockHistory).order_by(StockHistory.created_at, StockHistory.id)
+    if stock_id is not None:
+        query = query.filter(StockHistory.stock_id == stock_id)
+    if start is not None:
+        query = query.filter(StockHistory.created_at >= start)
+    if end is not None:
+        query = query.filter(StockHistory.created_at < end)
+    return export_response(
+        query=query,
+        schema=StockHistoryListSchema,
+        format=format,
+        filename="stock_history",
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@router.post("/ticks/bulk", response_model=StandardResponse)
+def ingest_ticks(
+    ticks: List[TickSchema],
+    db: Session = Depends(get_db),
+):
+    """Record a batch of price ticks in a fixed number of statements
+
+    Symbols are resolved with one IN query, every tick becomes a history row
+    in one executemany INSERT and each stock gets the price of its latest tick
+    in the batch through one UPDATE ... CASE.
+    """
+    if not ticks or len(ticks) > TICK_BATCH_MAX_SIZE:
+        return error_json_response(
+            message=f"Send between 1 and {TICK_BATCH_MAX_SIZE} ticks."
+        )
+
+    symbols = {tick.symbol for tick in ticks}
+    stock_ids: Dict[str, int] = dict(
+        db.execute(
+            select(Stock.symbol, Stock.id).where(Stock.symbol.in_(symbols))
+        ).all()
+    )
+
+    now = datetime.now(timezone.utc)
+    history_rows = []
+    latest: Dict[int, tuple] = {}
+    for tick in ticks:
+        stock_id = stock_ids.get(tick.symbol)
+        if stock_id is None:
+            continue
+        # naive timestamps are taken as UTC, aware and naive ones must compare
+        timestamp = _as_utc(tick.timestamp) if tick.timestamp else now
+        history_rows.append(
+            {"stock_id": stock_id, "price": tick.price, "created_at": timestamp}
+        )
+        # ties keep the later tick of the batch
+        if stock_id not in latest or timestamp >= latest[stock_id][0]:
+            latest[stock_id] = (timestamp, tick.price)
+
+    updated = []
+    if history_rows:
+        new_last_updated = case(
+            {stock_id: timestamp for stock_id, (timestamp, _) in latest.items()},
+            value=Stock.id,
+        )
+        try:
+            # executemany, sent as multi-row INSERTs by insertmanyvalues
+            db.execute(insert(StockHistory), history_rows)
+            # late or replayed ticks only add history, they never move a
+            # stock's price back to an older value
+            updated = db.execute(
+                update(Stock)
+                .where(Stock.id.in_(latest), Stock.last_updated < new_last_updated)
+                .values(
+                    price=case(
+                        {stock_id: price for stock_id, (_, price) in latest.items()},
+                        value=Stock.id,
+                    ),
+                    last_updated=new_last_updated,
+                )
+                .returning(Stock.id, Stock.symbol, Stock.price, Stock.last_updated)
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to ingest ticks: {str(e)}",
+            )
+        publish_quotes(updated)
+
+    return success_json_response(
+        data={
+            "accepted": len(history_rows),
+            "updated_stocks": len(updated),
+            "unknown_symbols": sorted(symbols - stock_ids.keys()),
+        },
+        message="Ticks ingested successfully.",
+    )
+
+
+@router.get("/{symbol}/bars", response_model=StandardResponse)
+def get_stock_bars(
+    symbol: str,
+    interval: BarInterval = BarInterval.minute,
+    bars_from: Optional[datetime] = Query(None, alias="from"),
+    bars_to: Optional[datetime] = Query(None, alias="to"),
+    limit: int = 500,
+    db: Session = Depends(get_read_db),
+):
+    """Open/high/low/close/count bars of a stock's price history"""
+    stock_id = db.scalar(select(Stock.id).where(Stock.symbol == symbol))
+    if stock_id is None:
+        return error_json_response(
+            message="Stock not found.", status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    bars = stock_bars(
+        db,
+        stock_id,
+        interval,
+        start=bars_from,
+        end=bars_to,
+        max_bars=min(max(limit, 1), 5000),
+    )
+    return success_json_response(
+        data=[BarSchema.model_validate(bar) for bar in bars],
+        message="Stock bars fetched successfully.",
+    )
+
+
+@router.get("/quote/{symbol}", response_model=StandardResponse)
+def get_quote(symbol: str):
+    """Latest price of a stock by symbol, served from the in-memory quote cache"""
+    quote = quote_cache.get(symbol)
+    if quote is None and not quote_cache.warm:
+        # warm-up failed at startup, only then is a session opened
+        with read_session() as db:
+            row = db.execute(
+                select(Stock.id, Stock.symbol, Stock.price, Stock.last_updated).where(
+                    Stock.symbol == symbol
+                )
+            ).first()
+        if row is not None:
+            quote = Quote(*row)
+            quote_cache.apply([quote])
+    if quote is None:
+        return error_json_response(
+            message="Stock not found.", status_code=status.HTTP_404_NOT_FOUND
+        )
+    return success_json_response(
+        data=QuoteSchema.model_validate(quote),
+        message="Quote fetched successfully.",
+    )
+
+
+def _batch_quotes(symbols: List[str]):
+    """Quotes for many symbols in request order, plus the unknown symbols"""
+    # strip blanks and duplicates, keeping the caller's order
+    symbols = [symbol.strip() for symbol in symbols]
+    symbols = list(dict.fromkeys(symbol for symbol in symbols if symbol))
+    if not symbols or len(symbols) > QUOTE_BATCH_MAX_SYMBOLS:
+        return error_json_response(
+            message=f"Send between 1 and {QUOTE_BATCH_MAX_SYMBOLS} symbols."
+        )
+
+    found = quote_cache.get_many(symbols)
+    missing = [symbol for symbol in symbols if symbol not in found]
+    if missing and not quote_cache.warm:
+        # warm-up failed at startup, resolve the misses with one IN query
+        with read_session() as db:
+            rows = db.execute(
+                select(Stock.id, Stock.symbol, Stock.price, Stock.last_updated).where(
+                    Stock.symbol.in_(missing)
+                )
+            ).all()
+        fetched = [Quote(*row) for row in rows]
+        quote_cache.apply(fetched)
+        found.update((quote.symbol, quote) for quote in fetched)
+
+    return success_json_response(
+        data={
+            "quotes": [
+                QuoteSchema.model_validate(found[symbol])
+                for symbol in symbols
+                if symbol in found
+            ],
+            "unknown_symbols": [symbol for symbol in symbols if symbol not in found],
+        },
+        message="Quotes fetched successfully.",
+    )
+
+
+@router.get("/quotes", response_model=StandardResponse)
+def get_quotes(
+    symbols: str = Query(..., description="Comma separated, e.g. AAPL,MSFT"),
+):
+    """Latest prices of many stocks at once, see POST /quotes for long lists"""
+    return _batch_quotes(symbols.split(","))
+
+
+@router.post("/quotes", response_model=StandardResponse)
+def post_quotes(symbols: List[str]):
+    """Latest prices of the stocks in the body, for lists too long for a URL"""
+    return _batch_quotes(symbols)
@@ -1,4 +1,6 @@
+from .bar import BarSchema
 from .history import StockHistoryListSchema
+from .quote import QuoteSchema
 from .stock import (
     StockCreateSchema,
     StockHistoryRetrieveSchema,
@@ -6,12 +8,16 @@ from .stock import (
     StockRetrieveSchema,
     StockUpdateSchema,
 )
+from .tick import TickSchema
 
 __all__ = [
+    "BarSchema",
+    "QuoteSchema",
     "StockCreateSchema",
     "StockListSchema",
     "StockRetrieveSchema",
     "StockUpdateSchema",
     "StockHistoryListSchema",
     "StockHistoryRetrieveSchema",
+    "TickSchema",
 ]
@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class BarSchema(BaseModel):
+    time: datetime
+    open: int
+    high: int
+    low: int
+    close: int
+    count: int
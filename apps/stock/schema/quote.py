@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class QuoteSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    symbol: str
+    price: int
+    last_updated: datetime
@@ -12,7 +12,7 @@ class StockListSchema(BaseModel):
     symbol: str
     company_name: str
     price: int
-    last_updated: str
+    last_updated: datetime
 
 
 class StockCreateSchema(BaseModel):
@@ -21,6 +21,7 @@ class StockCreateSchema(BaseModel):
     symbol: str
     company_name: str
     price: int
+    # naive values are taken as UTC
     last_updated: Optional[datetime] = None
 
 
@@ -30,7 +31,8 @@ class StockUpdateSchema(BaseModel):
     symbol: Optional[str] = None
     company_name: Optional[str] = None
     price: Optional[int] = None
-    last_updated: Optional[str] = None
+    # naive values are taken as UTC
+    last_updated: Optional[datetime] = None
 
 
 class StockRetrieveSchema(BaseModel):
@@ -40,7 +42,7 @@ class StockRetrieveSchema(BaseModel):
     symbol: str
     company_name: str
     price: int
-    last_updated: str
+    last_updated: datetime
 
 
 class StockHistoryRetrieveSchema(BaseModel):
@@ -50,5 +52,5 @@ class StockHistoryRetrieveSchema(BaseModel):
     symbol: str
     company_name: str
     price: int
-    last_updated: str
+    last_updated: datetime
     history: List[StockHistoryListSchema] = []
@@ -0,0 +1,11 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TickSchema(BaseModel):
+    symbol: str
+    price: int
+    # defaults to the time of ingestion, naive values are taken as UTC
+    timestamp: Optional[datetime] = None
@@ -1,55 +1,432 @@
+import base64
+import enum
+import json
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
 from math import ceil
-from typing import Dict, Generic, List, Optional, Type, TypeVar
+from typing import Dict, Generic, List, Optional, Tuple, Type, TypeVar
 
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from decouple import config
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy import (
+    Select,
+    String,
+    Table,
+    and_,
+    func,
+    inspect,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
 ModelType = TypeVar("ModelType")
 SchemaType = TypeVar("SchemaType")
 
+PAGINATION_COUNT_CACHE_TTL = config(
+    "PAGINATION_COUNT_CACHE_TTL", default=60, cast=float
+)
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+_count_cache: Dict[str, Tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
+
+class PaginationError(ValueError):
+    """Bad page, page_size, cursor or fields argument, a client error
+
+    Callers turn this into a 400. Anything else raised while building a page,
+    such as a pydantic ValidationError for a row that does not fit its
+    schema, is a server error and must not be caught with it.
+    """
+
+
+class CountMode(str, enum.Enum):
+    """How paginate() computes `total` in offset mode"""
+
+    exact = "exact"  # COUNT(*) on every call
+    cached = "cached"  # exact COUNT(*) cached per SQL + params
+    estimated = "estimated"  # PostgreSQL planner estimate, exact elsewhere
+    none = "none"  # no total, only whether a next page exists
+
 
 class PaginationMeta(BaseModel):
-    total: int
+    total: Optional[int]
+    total_exact: bool = True
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
     previous_page: Optional[int]
     next_page: Optional[int]
 
 
+class CursorPaginationMeta(BaseModel):
+    page_size: int
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
 class CustomPagination(BaseModel, Generic[SchemaType]):
     data: List[SchemaType]
     meta: Dict
 
 
-def paginate(
-    *,
-    query,
-    page: int = 1,  # assign default page value so we dont have to pass it every time
-    page_size: int = 10,
-    schema: Type[SchemaType],
-) -> CustomPagination[SchemaType]:
+@lru_cache(maxsize=256)
+def _list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def _validate_items(items, schema) -> list:
+    """Build `schema` instances for all rows with one cached TypeAdapter call"""
+    return _list_adapter(schema).validate_python(items, from_attributes=True)
+
+
+@lru_cache(maxsize=256)
+def _sparse_schema(schema, fields: frozenset):
+    """Copy of `schema` keeping only `fields`, cached per combination"""
+    return create_model(
+        f"{schema.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+def _project(query, schema, fields: Optional[str]):
+    """Load only the columns `schema` (or the `fields` subset of it) needs
+
+    `fields` is a comma separated sparse fieldset. Returns the query with
+    load_only() applied and the schema to serialize rows with. Columns left
+    out raise on access instead of lazy loading one row at a time.
+    """
+    if fields:
+        wanted = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = wanted - set(schema.model_fields)
+        if unknown:
+            raise PaginationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        schema = _sparse_schema(schema, frozenset(wanted))
+
+    model = query.column_descriptions[0]["entity"]
+    column_names = set(inspect(model).column_attrs.keys())
+    # created_at/id are needed for keyset cursors, the primary key is always loaded
+    names = (set(schema.model_fields) | {"created_at"}) & column_names
+    columns = [getattr(model, name) for name in sorted(names)]
+    return query.options(load_only(*columns, raiseload=True)), schema
+
+
+def encode_cursor(item, direction: str = "next") -> str:
+    """Opaque cursor pointing at `item`'s (created_at, id) position"""
+    payload = {"k": [item.created_at.isoformat(), item.id], "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        created_at, item_id = payload["k"]
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return datetime.fromisoformat(created_at), int(item_id), direction
+    except (ValueError, TypeError, KeyError):
+        raise PaginationError("Invalid cursor")
+
+
+def _sqlite_spellings(value: datetime) -> List[str]:
+    """Text forms a DateTime equal to `value` can be stored in by SQLite
+
+    SQLite keeps DateTime columns as text and compares them as text.
+    SQLAlchemy always writes fractional seconds ("... 12:00:00.000000") but
+    rows filled by the CURRENT_TIMESTAMP server default have none
+    ("... 12:00:00"), so a whole-second value has two spellings, in sort order.
+    """
+    spellings = [value.strftime("%Y-%m-%d %H:%M:%S.%f")]
+    if not value.microsecond:
+        spellings.insert(0, value.strftime("%Y-%m-%d %H:%M:%S"))
+    return spellings
+
+
+def _seek_condition(model, created_at: datetime, item_id: int, direction, dialect):
+    """Rows strictly past (created_at, id) in `direction`, newest first for next"""
+    if dialect != "sqlite":
+        key = tuple_(model.created_at, model.id)
+        bound = tuple_(literal(created_at, model.created_at.type), item_id)
+        return key < bound if direction == "next" else key > bound
+
+    # compare the raw text, every spelling of created_at counts as a tie; the
+    # plain range on created_at comes first so SQLite seeks the index
+    stored = type_coerce(model.created_at, String())
+    spellings = _sqlite_spellings(created_at)
+    if direction == "next":
+        return and_(
+            stored <= spellings[-1],
+            or_(stored < spellings[0], and_(stored.in_(spellings), model.id < item_id)),
+        )
+    return and_(
+        stored >= spellings[0],
+        or_(stored > spellings[-1], and_(stored.in_(spellings), model.id > item_id)),
+    )
+
+
+def _keyset_statement(query, page_size: int, cursor: str, dialect: str):
+    """Order `query` newest first by (created_at, id) and seek past `cursor`
+
+    Works for both ORM Query and select() objects. Returns the statement,
+    which fetches one extra row to detect another page, and the direction.
+    """
+    model = query.column_descriptions[0]["entity"]
+    newest_first = (model.created_at.desc(), model.id.desc())
+    query = query.order_by(None)
+    if not cursor:
+        return query.order_by(*newest_first).limit(page_size + 1), "next"
+
+    created_at, item_id, direction = decode_cursor(cursor)
+    query = query.filter(
+        _seek_condition(model, created_at, item_id, direction, dialect)
+    )
+    if direction == "next":
+        query = query.order_by(*newest_first)
+    else:
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+    return query.limit(page_size + 1), direction
+
+
+def _build_cursor_page(
+    rows, page_size: int, cursor: str, direction: str, schema
+) -> CustomPagination:
+    has_more = len(rows) > page_size
+    items = rows[:page_size]
+    if direction == "prev":
+        items.reverse()
+
+    next_cursor = prev_cursor = None
+    if items:
+        if direction == "prev" or has_more:
+            next_cursor = encode_cursor(items[-1], "next")
+        if (direction == "next" and cursor) or (direction == "prev" and has_more):
+            prev_cursor = encode_cursor(items[0], "prev")
+
+    meta = CursorPaginationMeta(
+        page_size=page_size, next_cursor=next_cursor, prev_cursor=prev_cursor
+    )
+    # data is already validated, skip re-validating it into CustomPagination
+    return CustomPagination.model_construct(
+        data=_validate_items(items, schema), meta=meta.model_dump()
+    )
+
+
+def _check_page_args(page: int, page_size: int) -> None:
     if page < 1:
-        raise ValueError("page must be >= 1")
+        raise PaginationError("page must be >= 1")
     if page_size < 1 or page_size > 100:
-        raise ValueError("page_size must be between 1 and 100")
+        raise PaginationError("page_size must be between 1 and 100")
+
+
+def _exact_count(session: Session, statement: Select) -> int:
+    return session.scalar(
+        select(func.count()).select_from(statement.order_by(None).subquery())
+    )
+
+
+def _cached_count(session: Session, statement: Select) -> Tuple[int, bool]:
+    """Exact count reused for PAGINATION_COUNT_CACHE_TTL seconds per SQL+params"""
+    compiled = statement.compile(dialect=session.get_bind().dialect)
+    key = f"{compiled}|{sorted(compiled.params.items())!r}"
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1], False
+
+    total = _exact_count(session, statement)
+    with _count_cache_lock:
+        if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+            for stale_key in [k for k, v in _count_cache.items() if v[0] <= now]:
+                del _count_cache[stale_key]
+            if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+                _count_cache.clear()
+        _count_cache[key] = (now + PAGINATION_COUNT_CACHE_TTL, total)
+    return total, True
+
+
+def _estimated_count(session: Session, statement: Select) -> Optional[int]:
+    """Planner row estimate on PostgreSQL, None on other databases
+
+    Unfiltered single-table queries read pg_class.reltuples, anything else
+    uses the row estimate of EXPLAIN for the query.
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
 
-    total = query.count()
-    total_pages = ceil(total / page_size) if total else 1
+    statement = statement.order_by(None)
+    froms = statement.get_final_froms()
+    if (
+        statement.whereclause is None
+        and len(froms) == 1
+        and isinstance(froms[0], Table)
+    ):
+        reltuples = session.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = CAST(:table_name AS regclass)"
+            ),
+            {"table_name": froms[0].fullname},
+        )
+        # -1 means the table was never vacuumed/analyzed
+        if reltuples is not None and reltuples >= 0:
+            return reltuples
 
-    if page > total_pages:
-        raise ValueError("Page not found")
+    compiled = statement.compile(dialect=bind.dialect)
+    params = (
+        tuple(compiled.params[name] for name in compiled.positiontup)
+        if compiled.positional
+        else compiled.params
+    )
+    plan = (
+        session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _count_total(
+    session: Session, statement: Select, count: CountMode
+) -> Tuple[Optional[int], bool]:
+    """Return (total, total_exact) for `statement` using the `count` strategy"""
+    if count == CountMode.cached:
+        return _cached_count(session, statement)
+    if count == CountMode.estimated:
+        estimate = _estimated_count(session, statement)
+        if estimate is not None:
+            return estimate, False
+    if count == CountMode.none:
+        return None, False
+    return _exact_count(session, statement), True
+
+
+def _total_pages(total: Optional[int], page_size: int) -> Optional[int]:
+    if total is None:
+        return None
+    return ceil(total / page_size) if total else 1
 
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
 
-    serialized_data = [schema.model_validate(item).model_dump() for item in items]
+def _build_page(
+    items,
+    total: Optional[int],
+    total_exact: bool,
+    page: int,
+    page_size: int,
+    schema,
+) -> CustomPagination:
+    # one row more than page_size is fetched to tell whether a next page exists
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    if page > 1 and not items:
+        raise PaginationError("Page not found")
 
     meta = PaginationMeta(
         total=total,
+        total_exact=total_exact,
         page=page,
         page_size=page_size,
-        total_pages=total_pages,
+        total_pages=_total_pages(total, page_size),
         previous_page=page - 1 if page > 1 else None,
-        next_page=page + 1 if page < total_pages else None,
+        next_page=page + 1 if has_next else None,
     )
-    return CustomPagination(data=serialized_data, meta=meta.model_dump())
+    return CustomPagination.model_construct(
+        data=_validate_items(items, schema), meta=meta.model_dump()
+    )
+
+
+def _check_page_exists(
+    total: Optional[int], total_exact: bool, page: int, page_size: int
+) -> None:
+    # skip the page query entirely when an exact total says it is out of range
+    if total_exact and page > _total_pages(total, page_size):
+        raise PaginationError("Page not found")
+
+
+def paginate(
+    *,
+    query,
+    page: int = 1,  # assign default page value so we dont have to pass it every time
+    page_size: int = 10,
+    schema: Type[SchemaType],
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.exact,
+    fields: Optional[str] = None,
+) -> CustomPagination[SchemaType]:
+    """Offset pagination, or keyset pagination when `cursor` is given
+
+    Keyset mode orders rows newest first by (created_at, id) and ignores
+    `page`. Pass an empty cursor for the first page, then the `next_cursor` /
+    `prev_cursor` values from the returned meta.
+
+    In offset mode `count` picks how `total` is computed, see CountMode.
+    Only the columns of `schema`, or of the comma separated `fields` subset
+    of it, are loaded from the database.
+    """
+    _check_page_args(page, page_size)
+    query, schema = _project(query, schema, fields)
+
+    if cursor is not None:
+        statement, direction = _keyset_statement(
+            query, page_size, cursor, query.session.get_bind().dialect.name
+        )
+        rows = statement.all()
+        return _build_cursor_page(rows, page_size, cursor, direction, schema)
+
+    total, total_exact = _count_total(query.session, query.statement, count)
+    _check_page_exists(total, total_exact, page, page_size)
+
+    items = query.offset((page - 1) * page_size).limit(page_size + 1).all()
+
+    return _build_page(items, total, total_exact, page, page_size, schema)
+
+
+async def apaginate(
+    *,
+    session: AsyncSession,
+    statement: Select,
+    page: int = 1,
+    page_size: int = 10,
+    schema: Type[SchemaType],
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.exact,
+    fields: Optional[str] = None,
+) -> CustomPagination[SchemaType]:
+    """Async counterpart of paginate() for select() statements on an AsyncSession"""
+    _check_page_args(page, page_size)
+    statement, schema = _project(statement, schema, fields)
+
+    if cursor is not None:
+        keyset_statement, direction = _keyset_statement(
+            statement, page_size, cursor, session.get_bind().dialect.name
+        )
+        rows = (await session.scalars(keyset_statement)).all()
+        return _build_cursor_page(list(rows), page_size, cursor, direction, schema)
+
+    total, total_exact = await session.run_sync(_count_total, statement, count)
+    _check_page_exists(total, total_exact, page, page_size)
+
+    result = await session.scalars(
+        statement.offset((page - 1) * page_size).limit(page_size + 1)
+    )
+
+    return _build_page(list(result.all()), total, total_exact, page, page_size, schema)
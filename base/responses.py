@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pydantic_core
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded in one pass by pydantic-core's Rust serializer
+
+    Content may hold Pydantic models, datetimes and enums directly, so
+    handlers do not need to model_dump() anything first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def _envelope(
+    success: bool,
+    data: Any,
+    message: Optional[str],
+    error: Optional[str],
+    errors: Optional[List[Dict[str, str]]],
+    meta: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    # same shape as base.route.StandardResponse without validating it
+    return {
+        "success": success,
+        "data": data,
+        "message": message,
+        "error": error,
+        "errors": errors,
+        "meta": meta
+        if meta is not None
+        else {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
+    }
+
+
+def success_json_response(
+    data: Any = None,
+    message: str = "Operation successful",
+    meta: Optional[Dict[str, Any]] = None,
+    status_code: int = status.HTTP_200_OK,
+) -> FastJSONResponse:
+    return FastJSONResponse(
+        status_code=status_code,
+        content=_envelope(True, data, message, None, None, meta),
+    )
+
+
+def error_json_response(
+    message: str = "Error occurred",
+    error: Optional[str] = None,
+    errors: Optional[List[Dict[str, str]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    status_code: int = status.HTTP_400_BAD_REQUEST,
+) -> FastJSONResponse:
+    return FastJSONResponse(
+        status_code=status_code,
+        content=_envelope(False, None, message, error, errors, meta),
+    )
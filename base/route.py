@@ -5,9 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy.orm import Session
 
-from apps.database import get_db
+from apps.database import get_db, get_read_db
 
-from .pagination import paginate
+from .pagination import CountMode, PaginationError, paginate
+from .responses import success_json_response
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
@@ -103,7 +104,13 @@ class ReadRouter(Generic[ModelType, ReadSchemaType]):
         self.router.get("", response_model=StandardResponse)(self.read_all)
 
     def read_all(
-        self, page: int = 1, page_size: int = 10, db: Session = Depends(get_db)
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.exact,
+        fields: Optional[str] = None,
+        db: Session = Depends(get_read_db),
     ):
         try:
             result = paginate(
@@ -111,8 +118,11 @@ class ReadRouter(Generic[ModelType, ReadSchemaType]):
                 page=page,
                 page_size=page_size,
                 schema=self.schema,
+                cursor=cursor,
+                count=count,
+                fields=fields,
             )
-        except ValueError as exc:
+        except PaginationError as exc:
             raise HTTPException(status_code=400, detail=str(exc))
 
         # Convert meta to dict if needed
@@ -122,8 +132,8 @@ class ReadRouter(Generic[ModelType, ReadSchemaType]):
             else dict(result.meta)
         )
         meta_dict["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return StandardResponse(
-            success=True,
+        # returned as a response so FastAPI skips response_model re-validation
+        return success_json_response(
             data=result.data,
             message="Retrieved successfully",
             meta=meta_dict,
@@ -145,7 +155,7 @@ class RetrieveRouter(Generic[ModelType, ReadSchemaType]):
         self.router = APIRouter(prefix=prefix, tags=tags)
         self.router.get("", response_model=StandardResponse)(self.retrieve)
 
-    def retrieve(self, id: int, db: Session = Depends(get_db)):
+    def retrieve(self, id: int, db: Session = Depends(get_read_db)):
         db_item = db.query(self.model).filter(self.model.id == id).first()
         if not db_item:
             raise HTTPException(status_code=404, detail="Not found")
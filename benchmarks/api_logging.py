@@ -0,0 +1,162 @@
+"""Per-request overhead of APILoggingMiddleware, before and after the ASGI rewrite
+
+"before" is the BaseHTTPMiddleware version the ASGI middleware replaced,
+copied below as it was: it buffers the whole body with +=, round-trips it
+through json, rebuilds the Response and commits the log row on the request
+path. "after" is the current middleware with the background log_writer
+running. "none" is the bare app, the difference to it is the overhead.
+
+Each case POSTs to an endpoint returning a small JSON body, a multi-MB JSON
+body, or the same multi-MB body as a StreamingResponse in 64 KiB chunks.
+
+    python -m benchmarks.api_logging --requests 500 --large-mb 4
+"""
+
+import argparse
+import json
+from typing import Callable
+
+from benchmarks.common import (
+    LATENCY_HEADERS,
+    latency_row,
+    measure,
+    print_table,
+    setup_database,
+)
+
+
+def legacy_middleware():
+    """APILoggingMiddleware as it was before the ASGI rewrite"""
+    from fastapi import Request, Response
+    from sqlalchemy.orm import Session
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    from apps.api_logs.models import APILog
+    from apps.database import get_db
+
+    class LegacyAPILoggingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next: Callable) -> Response:
+            body = None
+            if request.method.upper() != "GET":
+                try:
+                    body = await request.json()
+                except Exception:
+                    body = None
+
+            response = await call_next(request)
+
+            response_body = b""
+            async for chunk in response.body_iterator:
+                response_body += chunk
+
+            try:
+                response_content = json.dumps(json.loads(response_body.decode()))
+            except Exception:
+                response_content = response_body.decode()
+
+            if request.method.upper() != "GET":
+                db: Session = next(get_db())
+                db.add(
+                    APILog(
+                        url=str(request.url),
+                        method=request.method,
+                        ip=request.client.host if request.client else None,
+                        user_agent=request.headers.get("user-agent"),
+                        body=body,
+                        header=dict(request.headers),
+                        response=response_content,
+                        status_code=str(response.status_code),
+                    )
+                )
+                db.commit()
+
+            return Response(
+                content=response_body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                media_type=response.media_type,
+            )
+
+    return LegacyAPILoggingMiddleware
+
+
+def build_app(middleware, large_mb: int):
+    from fastapi import FastAPI, Response
+    from fastapi.responses import StreamingResponse
+
+    small = json.dumps({"success": True, "data": {"id": 1, "name": "x" * 100}})
+    # one JSON document of roughly large_mb MiB
+    row = json.dumps({"id": 1, "symbol": "AAPL", "price": 100, "note": "x" * 200})
+    count = large_mb * 1024 * 1024 // (len(row) + 1)
+    large = ("[" + ",".join([row] * count) + "]").encode()
+    chunk_size = 64 * 1024
+
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware)
+
+    @app.post("/small")
+    def small_response():
+        return Response(small, media_type="application/json")
+
+    @app.post("/large")
+    def large_response():
+        return Response(large, media_type="application/json")
+
+    @app.post("/stream")
+    def streamed_response():
+        chunks = (
+            large[index : index + chunk_size]
+            for index in range(0, len(large), chunk_size)
+        )
+        return StreamingResponse(chunks, media_type="application/json")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="per small case")
+    parser.add_argument("--large-requests", type=int, default=30)
+    parser.add_argument("--large-mb", type=int, default=4)
+    args = parser.parse_args()
+
+    setup_database()
+    from fastapi.testclient import TestClient
+
+    from apps.api_logs.middleware import APILoggingMiddleware
+    from apps.api_logs.writer import log_writer
+
+    variants = {
+        "none": None,
+        "before": legacy_middleware(),
+        "after": APILoggingMiddleware,
+    }
+    cases = [
+        ("/small", args.requests),
+        ("/large", args.large_requests),
+        ("/stream", args.large_requests),
+    ]
+    payload = {"symbol": "AAPL", "price": 100}
+
+    log_writer.start()
+    rows = []
+    try:
+        for path, repeat in cases:
+            for name, middleware in variants.items():
+                client = TestClient(build_app(middleware, args.large_mb))
+
+                def call():
+                    client.post(path, json=payload).raise_for_status()
+
+                measure(call, min(repeat, 10))  # warm-up
+                rows.append(latency_row(f"{path} {name}", measure(call, repeat)))
+    finally:
+        log_writer.stop()
+
+    print(f"large bodies: {args.large_mb} MiB")
+    print_table(LATENCY_HEADERS, rows)
+
+
+if __name__ == "__main__":
+    main()
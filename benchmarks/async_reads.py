@@ -0,0 +1,205 @@
+"""Sync vs async: /stocks/retrieve/{id} and /blog/posts/list under concurrency
+
+The async side is the real routers. The sync side is a twin app running the
+same queries through get_read_db()/paginate() in Starlette's threadpool,
+i.e. the endpoints as they were before get_async_db. Both are driven
+in-process through httpx's ASGI transport, so the numbers include routing
+and serialization but no network.
+
+On SQLite both sides end up in worker threads (aiosqlite runs each
+connection in its own thread), so expect a tie there. The difference shows
+against Postgres, where asyncpg waits on the socket without holding a thread.
+
+    python -m benchmarks.async_reads --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import (
+    LATENCY_HEADERS,
+    insert_rows,
+    latency_row,
+    print_table,
+    setup_database,
+)
+
+
+def seed(engine, stocks: int, history: int, posts: int) -> None:
+    from apps.authentication.models import User
+    from apps.blog.models import Post
+    from apps.blog.models.post import content_stats
+    from apps.stock.models import Stock, StockHistory
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    insert_rows(
+        engine,
+        User.__table__,
+        [{"username": "author", "email": "author@example.com", "hashed_password": "x"}],
+    )
+    insert_rows(
+        engine,
+        Stock.__table__,
+        (
+            {
+                "symbol": f"S{index}",
+                "company_name": f"Company {index}",
+                "price": 100,
+                "last_updated": start,
+            }
+            for index in range(stocks)
+        ),
+    )
+    insert_rows(
+        engine,
+        StockHistory.__table__,
+        (
+            {
+                "stock_id": stock_id,
+                "price": 100 + tick % 10,
+                "created_at": start + timedelta(seconds=tick),
+            }
+            for stock_id in range(1, stocks + 1)
+            for tick in range(history)
+        ),
+    )
+    content = "lorem ipsum dolor sit amet " * 40
+    insert_rows(
+        engine,
+        Post.__table__,
+        (
+            {
+                "author_id": 1,
+                "title": f"Post {index}",
+                "content": content,
+                **content_stats(content),
+                "created_at": start + timedelta(seconds=index),
+            }
+            for index in range(posts)
+        ),
+    )
+
+
+def sync_app():
+    """The two endpoints on a sync Session, run in the threadpool"""
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.orm import Session
+
+    from apps.blog.models import Post
+    from apps.blog.schemas import PostList
+    from apps.database import get_read_db
+    from apps.stock.models import Stock, StockHistory
+    from apps.stock.schema import StockHistoryListSchema, StockRetrieveSchema
+    from base.pagination import paginate
+    from base.responses import success_json_response
+    from base.route import ReadRouter
+
+    app = FastAPI()
+
+    @app.get("/api/v1/stocks/retrieve/{stock_id}")
+    def retrieve_stock(stock_id: int, db: Session = Depends(get_read_db)):
+        db_stock = db.get(Stock, stock_id)
+        history = paginate(
+            query=db.query(StockHistory).filter(StockHistory.stock_id == stock_id),
+            page_size=100,
+            schema=StockHistoryListSchema,
+            cursor="",
+        )
+        return success_json_response(
+            data={
+                **StockRetrieveSchema.model_validate(db_stock).model_dump(),
+                "history": history.data,
+                "history_meta": history.meta,
+            }
+        )
+
+    app.include_router(
+        ReadRouter(Post, PostList, prefix="/list").router,
+        prefix="/api/v1/blog/posts",
+    )
+    return app
+
+
+def async_app():
+    from fastapi import FastAPI
+
+    from apps.blog.route import router as blog_router
+    from apps.stock.route import router as stock_router
+
+    app = FastAPI()
+    app.include_router(stock_router, prefix="/api/v1/stocks")
+    app.include_router(blog_router, prefix="/api/v1/blog")
+    return app
+
+
+async def run_load(app, paths, requests: int, concurrency: int):
+    import httpx
+
+    from apps.database import async_engine
+
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one(path):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                samples.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        # warm-up: imports, pools and statement caches
+        for path in paths[:concurrency]:
+            await one(path)
+        samples.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(path) for path in paths[:requests]))
+        elapsed = time.perf_counter() - start
+    # pooled connections are bound to this event loop
+    await async_engine.dispose()
+    return samples, requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stocks", type=int, default=100)
+    parser.add_argument("--history", type=int, default=500, help="ticks per stock")
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    engine = setup_database()
+    seed(engine, args.stocks, args.history, args.posts)
+
+    pages = max(1, min(50, args.posts // 20))
+    endpoints = {
+        "/stocks/retrieve/{id}": [
+            f"/api/v1/stocks/retrieve/{index % args.stocks + 1}"
+            for index in range(args.requests)
+        ],
+        "/blog/posts/list": [
+            f"/api/v1/blog/posts/list?page={index % pages + 1}&page_size=20"
+            for index in range(args.requests)
+        ],
+    }
+    rows = []
+    for name, paths in endpoints.items():
+        for mode, app in (("sync", sync_app()), ("async", async_app())):
+            samples, throughput = asyncio.run(
+                run_load(app, paths, args.requests, args.concurrency)
+            )
+            rows.append([*latency_row(f"{name} {mode}", samples), f"{throughput:.0f}"])
+
+    print(f"concurrency {args.concurrency}, {engine.dialect.name}")
+    print_table([*LATENCY_HEADERS, "req/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
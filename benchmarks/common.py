@@ -0,0 +1,91 @@
+"""Helpers shared by the benchmark scripts in this directory
+
+Run a script from the repository root, e.g.
+
+    python -m benchmarks.async_reads --requests 2000
+
+Unless DATABASE_URL_ is already set, every run gets a throwaway SQLite
+database, which is fine for before/after comparisons on one machine. Point
+DATABASE_URL_ at an empty scratch Postgres database for absolute numbers.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Iterable, List, Sequence
+
+
+def setup_database():
+    """Configure the app for a benchmark run and create the tables
+
+    Call it before importing anything from apps/, the engines are built from
+    the environment at import time. Returns the primary engine.
+    """
+    os.environ.setdefault(
+        "DATABASE_URL_", f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+    )
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-" + "x" * 32)
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+    import main  # registers every model on Base.metadata
+    from apps.database import Base, engine
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def insert_rows(engine, table, rows: Iterable[dict], chunk_size: int = 10000) -> int:
+    """Bulk insert `rows` into `table` in multi-row INSERTs, returns the count"""
+    total = 0
+    batch = []
+    with engine.begin() as connection:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_size:
+                connection.execute(table.insert(), batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            connection.execute(table.insert(), batch)
+            total += len(batch)
+    return total
+
+
+def measure(fn: Callable, repeat: int) -> List[float]:
+    """Wall time of `repeat` calls of fn(), in seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def latency_row(label: str, samples: Sequence[float]) -> list:
+    """[label, calls, mean, p50, p99] with the times in milliseconds"""
+    return [
+        label,
+        len(samples),
+        f"{statistics.mean(samples) * 1000:.3f}",
+        f"{percentile(samples, 50) * 1000:.3f}",
+        f"{percentile(samples, 99) * 1000:.3f}",
+    ]
+
+
+LATENCY_HEADERS = ["case", "calls", "mean ms", "p50 ms", "p99 ms"]
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence]) -> None:
+    cells = [[str(value) for value in row] for row in [headers, *rows]]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for index, row in enumerate(cells):
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+        if index == 0:
+            print("  ".join("-" * width for width in widths))
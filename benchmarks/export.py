@@ -0,0 +1,122 @@
+"""Memory of exporting stock history: streamed NDJSON/CSV vs loading it all
+
+The streamed cases call the /stocks/history/export endpoint function and
+drain its StreamingResponse, the same path a request takes. The baseline
+loads every row, validates it and builds the NDJSON body in one piece,
+like a non-streaming endpoint would. Peak Python heap comes from
+tracemalloc; times are from a separate untraced run.
+
+    python -m benchmarks.export --rows 1000000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import insert_rows, print_table, setup_database
+
+
+def seed(engine, rows: int) -> None:
+    from apps.stock.models import Stock, StockHistory
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    insert_rows(
+        engine,
+        Stock.__table__,
+        [{"symbol": "AAPL", "company_name": "Apple", "price": 100}],
+    )
+    insert_rows(
+        engine,
+        StockHistory.__table__,
+        (
+            {
+                "stock_id": 1,
+                "price": 100 + index % 10,
+                "created_at": start + timedelta(milliseconds=index * 10),
+            }
+            for index in range(rows)
+        ),
+    )
+
+
+async def _drain(response) -> int:
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+def streamed(format):
+    from apps.database import SessionLocal
+    from apps.stock.route import export_stock_history
+
+    def run() -> int:
+        with SessionLocal() as db:
+            response = export_stock_history(
+                stock_id=None, format=format, start=None, end=None, db=db
+            )
+            return asyncio.run(_drain(response))
+
+    return run
+
+
+def load_all() -> int:
+    from apps.database import SessionLocal
+    from apps.stock.models import StockHistory
+    from apps.stock.schema import StockHistoryListSchema
+
+    with SessionLocal() as db:
+        rows = db.query(StockHistory).order_by(StockHistory.created_at).all()
+        items = [StockHistoryListSchema.model_validate(row) for row in rows]
+        body = "".join(item.model_dump_json() + "\n" for item in items).encode()
+        return len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument(
+        "--skip-baseline", action="store_true", help="skip the load-everything case"
+    )
+    args = parser.parse_args()
+
+    engine = setup_database()
+    seed(engine, args.rows)
+
+    from base.export import EXPORT_BATCH_SIZE, ExportFormat
+
+    cases = [
+        ("stream ndjson", streamed(ExportFormat.ndjson)),
+        ("stream csv", streamed(ExportFormat.csv)),
+    ]
+    if not args.skip_baseline:
+        cases.append(("load all, ndjson", load_all))
+
+    results = []
+    for name, run in cases:
+        start = time.perf_counter()
+        size = run()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append(
+            [
+                name,
+                f"{size / 2**20:.1f}",
+                f"{elapsed:.2f}",
+                f"{args.rows / elapsed:.0f}",
+                f"{peak / 2**20:.1f}",
+            ]
+        )
+
+    print(f"{args.rows} rows, EXPORT_BATCH_SIZE {EXPORT_BATCH_SIZE}")
+    print_table(["case", "body MiB", "seconds", "rows/s", "peak heap MiB"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Login throughput and latency of a cheap endpoint during a login storm
+
+Runs the full app (middleware and lifespan included) once with argon2 inline
+in the request threads (PASSWORD_HASH_WORKERS=0, the old behavior) and once
+per requested pool size. In each run `--concurrency` clients POST
+/auth/login in a loop for `--seconds` while one client polls
+/stocks/quote/{symbol}, an in-memory lookup served from the same
+threadpool. The throttles are opened up so they do not cap the storm.
+
+    python -m benchmarks.login_storm --workers 2 4 --seconds 10
+
+PASSWORD_HASH_WORKERS is read at import time, so every run is a child
+process; the ARGON2_* settings of the environment apply to all of them.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import insert_rows, percentile, print_table, setup_database
+
+USERNAME = "storm"
+PASSWORD = "storm-password"
+
+
+async def storm(seconds: float, concurrency: int) -> dict:
+    import httpx
+
+    import main
+    from apps.authentication.utils import hash_pool_stats
+
+    logins = {"ok": 0, "rejected": 0}
+    probes = []
+    deadline = time.perf_counter() + seconds
+    transport = httpx.ASGITransport(app=main.app)
+    async with (
+        main.lifespan(main.app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+
+        async def login_loop():
+            body = {"username": USERNAME, "password": PASSWORD}
+            while time.perf_counter() < deadline:
+                response = await client.post("/api/v1/auth/login", json=body)
+                if response.status_code == 200:
+                    logins["ok"] += 1
+                elif response.status_code == 503:
+                    logins["rejected"] += 1
+                else:
+                    response.raise_for_status()
+
+        async def probe_loop():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get("/api/v1/stocks/quote/AAPL")
+                probes.append(time.perf_counter() - start)
+                response.raise_for_status()
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe_loop(), *(login_loop() for _ in range(concurrency)))
+        stats = hash_pool_stats()
+
+    return {
+        "logins_per_s": logins["ok"] / seconds,
+        "rejected": logins["rejected"],
+        "probe_p50_ms": percentile(probes, 50) * 1000,
+        "probe_p99_ms": percentile(probes, 99) * 1000,
+        "probes": len(probes),
+        "workers": stats["workers"],
+    }
+
+
+def child(args) -> None:
+    engine = setup_database()
+
+    from apps.authentication.models import User
+    from apps.authentication.utils import pwd_context
+    from apps.stock.models import Stock
+
+    insert_rows(
+        engine,
+        User.__table__,
+        [
+            {
+                "username": USERNAME,
+                "email": "storm@example.com",
+                "hashed_password": pwd_context.hash(PASSWORD),
+            }
+        ],
+    )
+    insert_rows(
+        engine,
+        Stock.__table__,
+        [{"symbol": "AAPL", "company_name": "Apple", "price": 100}],
+    )
+    result = asyncio.run(storm(args.seconds, args.concurrency))
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[2], help="hash pool sizes to try"
+    )
+    parser.add_argument("--concurrency", type=int, default=16, help="login clients")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    results = []
+    for workers in [0, *args.workers]:
+        env = {
+            **os.environ,
+            "PASSWORD_HASH_WORKERS": str(workers),
+            "PASSWORD_HASH_MAX_PENDING": str(max(workers * 8, 1)),
+            "LOGIN_IP_RATE": "1000000",
+            "LOGIN_IP_BURST": "1000000",
+            "LOGIN_USERNAME_RATE": "1000000",
+            "LOGIN_USERNAME_BURST": "1000000",
+        }
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.login_storm",
+                "--child",
+                "--concurrency",
+                str(args.concurrency),
+                "--seconds",
+                str(args.seconds),
+            ],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        cpus = os.cpu_count() or 1
+        cores = min(workers, cpus) if workers else cpus
+        results.append(
+            [
+                f"{workers} (inline)" if workers == 0 else str(workers),
+                f"{result['logins_per_s']:.1f}",
+                f"{result['logins_per_s'] / cores:.1f}",
+                result["rejected"],
+                f"{result['probe_p50_ms']:.1f}",
+                f"{result['probe_p99_ms']:.1f}",
+            ]
+        )
+
+    print(
+        f"{args.concurrency} login clients for {args.seconds:g}s, "
+        f"{os.cpu_count()} CPUs (inline hashing may use all of them)"
+    )
+    print_table(
+        [
+            "hash workers",
+            "logins/s",
+            "logins/s/core",
+            "503s",
+            "probe p50 ms",
+            "probe p99 ms",
+        ],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
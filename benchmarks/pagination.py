@@ -0,0 +1,135 @@
+"""Offset vs keyset pagination on api_logs and stock_history, page 1 vs deep pages
+
+Calls paginate() directly, newest first, with count=none so the offset
+numbers are the page query alone. The keyset cursor for the deep page is
+encoded from the row just before it, the same cursor a client would hold
+after walking there.
+
+    python -m benchmarks.pagination --rows 300000 --page 10000
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import (
+    LATENCY_HEADERS,
+    insert_rows,
+    latency_row,
+    measure,
+    print_table,
+    setup_database,
+)
+
+
+def seed(engine, rows: int) -> None:
+    from apps.api_logs.models import APILog
+    from apps.stock.models import Stock, StockHistory
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    insert_rows(
+        engine,
+        APILog.__table__,
+        (
+            {
+                "url": f"http://testserver/api/v1/stocks/update/{index % 100}",
+                "method": "PATCH",
+                "ip": "127.0.0.1",
+                "user_agent": "benchmark",
+                "header": {"content-type": "application/json"},
+                "status_code": "200",
+                "created_at": start + timedelta(milliseconds=index * 10),
+            }
+            for index in range(rows)
+        ),
+    )
+    insert_rows(
+        engine,
+        Stock.__table__,
+        [{"symbol": "AAPL", "company_name": "Apple", "price": 100}],
+    )
+    insert_rows(
+        engine,
+        StockHistory.__table__,
+        (
+            {
+                "stock_id": 1,
+                "price": 100 + index % 10,
+                "created_at": start + timedelta(milliseconds=index * 10),
+            }
+            for index in range(rows)
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300000, help="per table")
+    parser.add_argument("--page", type=int, default=10000, help="deep page number")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if (args.page - 1) * args.page_size >= args.rows:
+        parser.error("--page is past the last row, raise --rows")
+
+    engine = setup_database()
+    seed(engine, args.rows)
+
+    from apps.api_logs.models import APILog
+    from apps.api_logs.schemas import APILogList
+    from apps.database import SessionLocal
+    from apps.stock.models import StockHistory
+    from apps.stock.schema import StockHistoryListSchema
+    from base.pagination import CountMode, encode_cursor, paginate
+
+    tables = [
+        ("api_logs", APILog, APILogList, lambda db: db.query(APILog)),
+        (
+            "stock_history",
+            StockHistory,
+            StockHistoryListSchema,
+            lambda db: db.query(StockHistory).filter(StockHistory.stock_id == 1),
+        ),
+    ]
+    results = []
+    with SessionLocal() as db:
+        for name, model, schema, query in tables:
+            # the row a client would hold the cursor of when asking for args.page
+            before_page = (
+                query(db)
+                .order_by(model.created_at.desc(), model.id.desc())
+                .offset((args.page - 1) * args.page_size - 1)
+                .first()
+            )
+            cursors = {1: "", args.page: encode_cursor(before_page)}
+            for page in (1, args.page):
+
+                def offset_page():
+                    paginate(
+                        query=query(db).order_by(
+                            model.created_at.desc(), model.id.desc()
+                        ),
+                        page=page,
+                        page_size=args.page_size,
+                        schema=schema,
+                        count=CountMode.none,
+                    )
+
+                def keyset_page():
+                    paginate(
+                        query=query(db),
+                        page_size=args.page_size,
+                        schema=schema,
+                        cursor=cursors[page],
+                    )
+
+                for mode, fn in (("offset", offset_page), ("keyset", keyset_page)):
+                    fn()  # warm-up
+                    samples = measure(fn, args.repeat)
+                    results.append(latency_row(f"{name} page {page} {mode}", samples))
+
+    print(f"{args.rows} rows per table, page_size {args.page_size}")
+    print_table(LATENCY_HEADERS, results)
+
+
+if __name__ == "__main__":
+    main()
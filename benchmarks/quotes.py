@@ -0,0 +1,115 @@
+"""Prices for N symbols: N x /stocks/retrieve/{id} vs one /stocks/quotes call
+
+"retrieve" is what dashboards did before, one request per stock, each
+loading the stock and a page of its history. "quotes warm" is one GET
+/stocks/quotes served from the warmed quote cache. "quotes cold" is the
+same call when warm-up failed: a fresh, unwarmed cache per call, so the
+misses are resolved with the one IN query every time.
+
+    python -m benchmarks.quotes --symbols 50 500
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import (
+    LATENCY_HEADERS,
+    insert_rows,
+    latency_row,
+    measure,
+    print_table,
+    setup_database,
+)
+
+
+def seed(engine, stocks: int, history: int) -> None:
+    from apps.stock.models import Stock, StockHistory
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    insert_rows(
+        engine,
+        Stock.__table__,
+        (
+            {
+                "symbol": f"S{index}",
+                "company_name": f"Company {index}",
+                "price": 100,
+                "last_updated": start,
+            }
+            for index in range(stocks)
+        ),
+    )
+    insert_rows(
+        engine,
+        StockHistory.__table__,
+        (
+            {
+                "stock_id": stock_id,
+                "price": 100 + tick % 10,
+                "created_at": start + timedelta(seconds=tick),
+            }
+            for stock_id in range(1, stocks + 1)
+            for tick in range(history)
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--history", type=int, default=200, help="ticks per stock")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = setup_database()
+    seed(engine, max(args.symbols), args.history)
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from apps.database import SessionLocal
+    from apps.stock import route
+    from apps.stock.quotes import QuoteCache
+
+    app = FastAPI()
+    app.include_router(route.router, prefix="/api/v1/stocks")
+    client = TestClient(app)
+    warm_cache = QuoteCache()
+    with SessionLocal() as db:
+        warm_cache.load(db)
+
+    results = []
+    for count in args.symbols:
+        symbols = ",".join(f"S{index}" for index in range(count))
+
+        def retrieve_each():
+            for stock_id in range(1, count + 1):
+                client.get(f"/api/v1/stocks/retrieve/{stock_id}").raise_for_status()
+
+        def quotes():
+            response = client.get("/api/v1/stocks/quotes", params={"symbols": symbols})
+            response.raise_for_status()
+            assert not response.json()["data"]["unknown_symbols"]
+
+        def quotes_cold():
+            route.quote_cache = QuoteCache()
+            quotes()
+
+        for name, fn in (
+            ("retrieve", retrieve_each),
+            ("quotes warm", quotes),
+            ("quotes cold", quotes_cold),
+        ):
+            route.quote_cache = warm_cache
+            fn()  # warm-up
+            results.append(
+                latency_row(f"{count} symbols {name}", measure(fn, args.repeat))
+            )
+    route.quote_cache = warm_cache
+
+    print(f"{args.history} history rows per stock, {engine.dialect.name}")
+    print_table(LATENCY_HEADERS, results)
+
+
+if __name__ == "__main__":
+    main()
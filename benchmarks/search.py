@@ -0,0 +1,117 @@
+"""Full-text post search vs a LIKE scan, over a large posts table
+
+Seeds posts with random text from a fixed vocabulary (Zipf-like, so some
+words are rare and some are everywhere), then times search_posts() against
+the LIKE '%word%' scan over title and content it replaces, for a rare word,
+a common word and a two-word query. search_posts() uses the FTS5 table on
+SQLite and the tsvector GIN index on PostgreSQL.
+
+Ranked search scores every matching post before applying the limit, so a
+word found in most posts costs more than the unranked LIKE, which stops at
+the first `--limit` rows it finds. Seeding 1M posts takes several minutes.
+
+    python -m benchmarks.search --posts 1000000
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import (
+    LATENCY_HEADERS,
+    insert_rows,
+    latency_row,
+    measure,
+    print_table,
+    setup_database,
+)
+
+# fixed width, so LIKE '%w0001%' matches the same posts as the token w0001;
+# w0000 is the most common word, w4999 the rarest
+VOCABULARY = [f"w{index:04d}" for index in range(5000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def seed(engine, posts: int, words: int) -> None:
+    from apps.authentication.models import User
+    from apps.blog.models import Post
+    from apps.blog.models.post import content_stats
+
+    generator = random.Random(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    insert_rows(
+        engine,
+        User.__table__,
+        [{"username": "author", "email": "author@example.com", "hashed_password": "x"}],
+    )
+
+    def rows():
+        for index in range(posts):
+            title = " ".join(generator.choices(VOCABULARY, WEIGHTS, k=6))
+            content = " ".join(generator.choices(VOCABULARY, WEIGHTS, k=words))
+            yield {
+                "author_id": 1,
+                "title": title,
+                "content": content,
+                **content_stats(content),
+                "created_at": start + timedelta(seconds=index),
+            }
+
+    insert_rows(engine, Post.__table__, rows(), chunk_size=5000)
+
+
+def like_scan(db, q: str, limit: int):
+    """What a search without a full-text index looks like"""
+    from sqlalchemy import and_, or_
+
+    from apps.blog.models import Post
+
+    conditions = [
+        or_(Post.title.ilike(f"%{word}%"), Post.content.ilike(f"%{word}%"))
+        for word in q.split()
+    ]
+    return (
+        db.query(Post.id, Post.title)
+        .filter(and_(*conditions))
+        .order_by(Post.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1000000)
+    parser.add_argument("--words", type=int, default=60, help="words per post")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = setup_database()
+    seed(engine, args.posts, args.words)
+
+    from apps.blog.search import search_posts
+    from apps.database import SessionLocal
+
+    queries = {
+        "rare word": "w4321",
+        "common word": "w0001",
+        "two words": "w0007 w0250",
+    }
+    results = []
+    with SessionLocal() as db:
+        for name, q in queries.items():
+            cases = (
+                ("full-text", lambda: search_posts(db, q, limit=args.limit)),
+                ("LIKE scan", lambda: like_scan(db, q, args.limit)),
+            )
+            for mode, fn in cases:
+                fn()  # warm-up
+                results.append(latency_row(f"{name} {mode}", measure(fn, args.repeat)))
+
+    print(f"{args.posts} posts of {args.words} words, {engine.dialect.name}")
+    print_table(LATENCY_HEADERS, results)
+
+
+if __name__ == "__main__":
+    main()
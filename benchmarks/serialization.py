@@ -0,0 +1,125 @@
+"""Time to turn a 100-row page into response bytes, old path vs FastJSONResponse
+
+"before" is what list endpoints did before base/responses.py: model_validate
+and model_dump per row, a validated CustomPagination, a StandardResponse
+dumped with mode="json", then JSONResponse encoding it with stdlib json.
+"after" is the current path: one cached TypeAdapter call for the page,
+model_construct, and success_json_response() encoding the envelope with
+pydantic-core. Rows are plain attribute objects, so no database is involved.
+
+    python -m benchmarks.serialization --rows 100 --repeat 2000
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from benchmarks.common import (
+    LATENCY_HEADERS,
+    latency_row,
+    measure,
+    print_table,
+    setup_database,
+)
+
+META = {
+    "total": 1000,
+    "total_exact": True,
+    "page": 1,
+    "page_size": 100,
+    "total_pages": 10,
+    "previous_page": None,
+    "next_page": 2,
+}
+
+
+def stock_rows(count: int) -> list:
+    return [
+        SimpleNamespace(
+            id=index,
+            symbol=f"S{index}",
+            company_name=f"Company {index}",
+            price=100 + index,
+            last_updated=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        for index in range(count)
+    ]
+
+
+def api_log_rows(count: int) -> list:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=index,
+            url=f"http://testserver/api/v1/stocks/update/{index}",
+            method="PATCH",
+            ip="127.0.0.1",
+            user_agent="benchmark",
+            header={"content-type": "application/json", "accept": "*/*"},
+            system_details={},
+            extra_field=None,
+            user_id=1,
+            status_code="200",
+            created_at=start + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def before(rows, schema):
+    from fastapi.responses import JSONResponse
+
+    from base.pagination import CustomPagination
+    from base.route import StandardResponse
+
+    data = [schema.model_validate(row).model_dump() for row in rows]
+    page = CustomPagination(data=data, meta=META)
+    return JSONResponse(
+        content=StandardResponse.success_response(
+            data=page.data, message="Fetched successfully.", meta=page.meta
+        ).model_dump(mode="json"),
+    ).body
+
+
+def after(rows, schema):
+    from base.pagination import CustomPagination, _validate_items
+    from base.responses import success_json_response
+
+    page = CustomPagination.model_construct(
+        data=_validate_items(rows, schema), meta=META
+    )
+    return success_json_response(
+        data=page.data, message="Fetched successfully.", meta=page.meta
+    ).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_database()
+    from apps.api_logs.schemas import APILogList
+    from apps.stock.schema import StockListSchema
+
+    cases = [
+        ("StockListSchema", StockListSchema, stock_rows(args.rows)),
+        ("APILogList", APILogList, api_log_rows(args.rows)),
+    ]
+    results = []
+    for name, schema, rows in cases:
+        for label, build in (("before", before), ("after", after)):
+            build(rows, schema)  # warm-up, builds the cached adapters
+
+            def call():
+                build(rows, schema)
+
+            results.append(latency_row(f"{name} {label}", measure(call, args.repeat)))
+
+    print(f"{args.rows} rows per page")
+    print_table(LATENCY_HEADERS, results)
+
+
+if __name__ == "__main__":
+    main()
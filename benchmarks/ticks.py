@@ -0,0 +1,107 @@
+"""Tick ingestion throughput: one PATCH per tick vs /stocks/ticks/bulk batches
+
+Both go through the stock router over HTTP (TestClient, no network). The
+per-tick case is PATCH /stocks/update/{id}, which is how a feed had to
+record prices before the bulk endpoint; the bulk case posts the same kind
+of ticks in batches of each `--batch-sizes` value. Ticks are spread over
+`--stocks` symbols with increasing timestamps, so every batch moves prices.
+
+    python -m benchmarks.ticks --ticks 100000 --batch-sizes 100 1000 10000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import insert_rows, print_table, setup_database
+
+
+def make_ticks(count: int, stocks: int, start: datetime) -> list:
+    return [
+        {
+            "symbol": f"S{index % stocks}",
+            "price": 100 + index % 50,
+            "timestamp": (start + timedelta(milliseconds=index)).isoformat(),
+        }
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stocks", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=100000, help="per bulk case")
+    parser.add_argument(
+        "--single-ticks", type=int, default=2000, help="for the PATCH-per-tick case"
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[100, 1000, 10000]
+    )
+    args = parser.parse_args()
+
+    engine = setup_database()
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from apps.stock.models import Stock
+    from apps.stock.route import router as stock_router
+
+    insert_rows(
+        engine,
+        Stock.__table__,
+        (
+            {
+                "symbol": f"S{index}",
+                "company_name": f"Company {index}",
+                "price": 100,
+                "last_updated": datetime(2000, 1, 1, tzinfo=timezone.utc),
+            }
+            for index in range(args.stocks)
+        ),
+    )
+    app = FastAPI()
+    app.include_router(stock_router, prefix="/api/v1/stocks")
+    client = TestClient(app)
+    # PATCH stamps stocks with the current time, so every bulk case gets its
+    # own later time range; stale ticks would skip the price UPDATE
+    start = datetime.now(timezone.utc)
+
+    results = []
+    ticks = make_ticks(args.single_ticks, args.stocks, start)
+    began = time.perf_counter()
+    for tick in ticks:
+        stock_id = int(tick["symbol"][1:]) + 1
+        client.patch(
+            f"/api/v1/stocks/update/{stock_id}", json={"price": tick["price"]}
+        ).raise_for_status()
+    elapsed = time.perf_counter() - began
+    results.append(["PATCH per tick", len(ticks), f"{len(ticks) / elapsed:.0f}"])
+
+    for case_index, batch_size in enumerate(args.batch_sizes, start=1):
+        case_start = start + timedelta(days=case_index)
+        ticks = make_ticks(args.ticks, args.stocks, case_start)
+        batches = [
+            ticks[index : index + batch_size]
+            for index in range(0, len(ticks), batch_size)
+        ]
+        began = time.perf_counter()
+        for batch in batches:
+            response = client.post("/api/v1/stocks/ticks/bulk", json=batch)
+            response.raise_for_status()
+            assert response.json()["data"]["updated_stocks"], "ticks were stale"
+        elapsed = time.perf_counter() - began
+        results.append(
+            [
+                f"bulk, batches of {batch_size}",
+                len(ticks),
+                f"{len(ticks) / elapsed:.0f}",
+            ]
+        )
+
+    print(f"{args.stocks} stocks, {engine.dialect.name}")
+    print_table(["case", "ticks", "ticks/s"], results)
+
+
+if __name__ == "__main__":
+    main()
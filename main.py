@@ -1,13 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import APIRouter, FastAPI
+from starlette.concurrency import run_in_threadpool
 
 from apps.api_logs.middleware import APILoggingMiddleware
 from apps.api_logs.route import router as api_logs_router
+from apps.api_logs.writer import log_writer
 from apps.authentication.auth_routes import router as auth_router
+from apps.authentication.revocation import revocation_list
 from apps.authentication.user_routes import router as user_router
+from apps.authentication.utils import shutdown_hash_pool, start_hash_pool
 from apps.blog.route import router as blog_router
+from apps.diagnostics.middleware import QueryStatsMiddleware
+from apps.diagnostics.route import router as diagnostics_router
+from apps.stock.quotes import start_quote_cache, stop_quote_cache
 from apps.stock.route import router as stock_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_writer.start()
+    start_hash_pool()
+    await run_in_threadpool(revocation_list.start)
+    await run_in_threadpool(start_quote_cache)
+    yield
+    # flush queued api/error logs before the worker exits
+    await run_in_threadpool(log_writer.stop)
+    await run_in_threadpool(shutdown_hash_pool)
+    await run_in_threadpool(revocation_list.stop)
+    await run_in_threadpool(stop_quote_cache)
+
+
+app = FastAPI(lifespan=lifespan)
+# added first so it sits inside APILoggingMiddleware and only sees endpoint queries
+app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(APILoggingMiddleware)
 v1_router = APIRouter(prefix="/api/v1")
 v1_router.include_router(api_logs_router, prefix="/api-logs", tags=["API Logs"])
@@ -15,6 +41,9 @@ v1_router.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 v1_router.include_router(user_router, prefix="/users", tags=["Users"])
 v1_router.include_router(blog_router, prefix="/blog", tags=["Blog"])
 v1_router.include_router(stock_router, prefix="/stocks", tags=["Stocks"])
+v1_router.include_router(
+    diagnostics_router, prefix="/diagnostics", tags=["Diagnostics"]
+)
 
 # v2_router = APIRouter(prefix="/api/v2")
 # v2_router.include_router(auth_router, prefix="/auth", tags=["v2-auth"])
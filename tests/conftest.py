@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+# apps.database builds its engines from these at import time
+os.environ.setdefault("DATABASE_URL_", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+import pytest
+
+from apps.api_logs.models import APILog, ErrorLog
+from apps.authentication.models import RevokedToken, User
+from apps.blog.models import Post
+from apps.database import Base, SessionLocal, engine
+from apps.stock.models import Stock, StockHistory
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    Base.metadata.create_all(engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+
+
+@pytest.fixture
+def user(db):
+    user = User(username="author", email="author@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+from apps.stock.bars import BarInterval, stock_bars
+from apps.stock.models import Stock, StockHistory
+
+
+def _at(hour, minute, second=0, microsecond=0):
+    return datetime(2026, 1, 1, hour, minute, second, microsecond, tzinfo=timezone.utc)
+
+
+def test_bars_bucket_boundaries_and_open_close_order(db):
+    stock = Stock(symbol="AAPL", company_name="Apple", price=100)
+    db.add(stock)
+    db.flush()
+    # inserted out of time order: open/close follow created_at, then id
+    for created_at, price in [
+        (_at(9, 0), 1),  # before the window of the last 5 minutes
+        (_at(10, 0, 59, 999999), 12),
+        (_at(10, 0), 10),
+        (_at(10, 0, 30), 11),
+        (_at(10, 1, 50), 22),
+        (_at(10, 1), 20),
+        (_at(10, 1, 40), 19),
+        (_at(10, 1, 50), 23),  # same instant as 22, later id closes the bar
+        (_at(10, 2), 99),  # end is exclusive
+    ]:
+        db.add(StockHistory(stock_id=stock.id, price=price, created_at=created_at))
+    db.commit()
+
+    bars = stock_bars(db, stock.id, BarInterval.minute, end=_at(10, 2), max_bars=5)
+
+    assert bars == [
+        {
+            "time": "2026-01-01T10:00:00",
+            "open": 10,
+            "high": 12,
+            "low": 10,
+            "close": 12,
+            "count": 3,
+        },
+        {
+            "time": "2026-01-01T10:01:00",
+            "open": 20,
+            "high": 23,
+            "low": 19,
+            "close": 23,
+            "count": 4,
+        },
+    ]
+
+
+def test_bars_window_ends_with_the_bucket_end_cuts_short(db):
+    stock = Stock(symbol="AAPL", company_name="Apple", price=100)
+    db.add(stock)
+    db.flush()
+    for created_at in [_at(10, 0, 10), _at(10, 1, 10), _at(10, 2, 10)]:
+        db.add(StockHistory(stock_id=stock.id, price=1, created_at=created_at))
+    db.commit()
+
+    bars = stock_bars(db, stock.id, BarInterval.minute, end=_at(10, 2, 30), max_bars=2)
+    assert [bar["time"] for bar in bars] == [
+        "2026-01-01T10:01:00",
+        "2026-01-01T10:02:00",
+    ]
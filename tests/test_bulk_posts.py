@@ -0,0 +1,53 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apps.blog import route
+from apps.blog.models import Post
+from apps.database import get_db
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(route.router, prefix="/blog")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def _post(user, title="Hello", content="some words"):
+    return {"title": title, "content": content, "author_id": user.id}
+
+
+def test_bad_items_are_reported_by_index(client, db, user):
+    items = [
+        _post(user, title="first"),
+        42,
+        _post(user, title="x" * 256),
+        {**_post(user), "author_id": user.id + 1},
+        {"title": "no content", "author_id": user.id},
+        _post(user, title="last"),
+    ]
+    response = client.post("/blog/posts/bulk-create", json=items)
+
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert [post["index"] for post in data["created"]] == [0, 5]
+    assert [error["index"] for error in data["errors"]] == [1, 2, 3, 4]
+    assert db.query(Post).count() == 2
+
+
+def test_rows_the_database_rejects_do_not_fail_the_batch(client, db, user, monkeypatch):
+    def content_stats(content):
+        # a NOT NULL violation, which only the database sees
+        return {"author_id": None} if content == "boom" else {}
+
+    monkeypatch.setattr(route, "content_stats", content_stats)
+    items = [_post(user), _post(user, content="boom"), _post(user)]
+    response = client.post("/blog/posts/bulk-create", json=items)
+
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert [post["index"] for post in data["created"]] == [0, 2]
+    assert [error["index"] for error in data["errors"]] == [1]
+    assert db.query(Post).count() == 2
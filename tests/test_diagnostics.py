@@ -0,0 +1,30 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apps.authentication.authentication import create_access_token
+from apps.database import get_db
+from apps.diagnostics.route import router
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(router, prefix="/diagnostics")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def _headers(user):
+    token = create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_diagnostics_are_for_superusers_only(client, db, user):
+    # 401 or 403 for a missing token, depending on the FastAPI version
+    assert client.get("/diagnostics/pool").status_code in (401, 403)
+    assert client.get("/diagnostics/pool", headers=_headers(user)).status_code == 403
+
+    user.is_superuser = True
+    db.commit()
+    assert client.get("/diagnostics/pool", headers=_headers(user)).status_code == 200
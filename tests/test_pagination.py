@@ -0,0 +1,199 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from apps.blog.models import Post
+from apps.blog.schemas import PostList, PostSummary
+from apps.database import engine
+from base.pagination import (
+    CountMode,
+    PaginationError,
+    _count_cache,
+    decode_cursor,
+    paginate,
+)
+
+
+def _walk(db, direction="next", cursor="", page_size=2, limit=20):
+    """Titles of every page reached by following `direction` cursors"""
+    titles = []
+    for _ in range(limit):
+        page = paginate(
+            query=db.query(Post),
+            page_size=page_size,
+            schema=PostSummary,
+            cursor=cursor,
+        )
+        titles.append([post.title for post in page.data])
+        cursor = page.meta[f"{direction}_cursor"]
+        if cursor is None:
+            return titles, page
+    raise AssertionError(f"cursor walk did not end: {titles}")
+
+
+def test_keyset_walks_every_row_once(db, user):
+    now = datetime(2026, 1, 1, 12, 0, 0, 500)
+    db.add_all(
+        Post(author_id=user.id, title=f"t{i}", created_at=now + timedelta(seconds=i))
+        for i in range(5)
+    )
+    db.commit()
+
+    pages, _ = _walk(db)
+    assert pages == [["t4", "t3"], ["t2", "t1"], ["t0"]]
+
+
+def test_keyset_with_server_default_timestamps(db, user):
+    # CURRENT_TIMESTAMP rows share one second and are stored without
+    # fractional seconds on SQLite
+    db.add_all(Post(author_id=user.id, title=f"t{i}") for i in range(5))
+    db.commit()
+
+    pages, last = _walk(db)
+    assert sum(pages, []) == ["t4", "t3", "t2", "t1", "t0"]
+
+    back, _ = _walk(db, "prev", cursor=last.meta["prev_cursor"])
+    assert back == [["t2", "t1"], ["t4", "t3"]]
+
+
+def test_keyset_with_whole_second_timestamps(db, user):
+    # explicit values are stored with fractional seconds even when they are 0,
+    # unlike CURRENT_TIMESTAMP rows
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    db.add_all(Post(author_id=user.id, title=f"t{i}", created_at=now) for i in range(3))
+    db.add(Post(author_id=user.id, title="older", created_at=now - timedelta(1)))
+    db.add(Post(author_id=user.id, title="server default"))
+    db.commit()
+
+    pages, last = _walk(db)
+    assert sum(pages, []) == ["server default", "t2", "t1", "t0", "older"]
+
+    back, _ = _walk(db, "prev", cursor=last.meta["prev_cursor"])
+    assert back == [["t1", "t0"], ["server default", "t2"]]
+
+
+def test_keyset_empty_cursor_has_no_prev(db, user):
+    db.add(Post(author_id=user.id, title="only"))
+    db.commit()
+
+    page = paginate(query=db.query(Post), schema=PostSummary, cursor="")
+    assert [post.title for post in page.data] == ["only"]
+    assert page.meta == {"page_size": 10, "next_cursor": None, "prev_cursor": None}
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not-a-cursor",
+        "é",
+        _raw_cursor(5),
+        _raw_cursor([1, 2]),
+        _raw_cursor({"d": "next"}),
+        _raw_cursor({"k": [1], "d": "next"}),
+        _raw_cursor({"k": [None, 1], "d": "next"}),
+        _raw_cursor({"k": ["yesterday", 1], "d": "next"}),
+        _raw_cursor({"k": ["2026-01-01T00:00:00", "x"], "d": "next"}),
+        _raw_cursor({"k": ["2026-01-01T00:00:00", 1]}),
+        _raw_cursor({"k": ["2026-01-01T00:00:00", 1], "d": "up"}),
+    ],
+)
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(PaginationError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def posts(db, user):
+    db.add_all(Post(author_id=user.id, title=f"t{i}") for i in range(5))
+    db.commit()
+    _count_cache.clear()
+
+
+def _page(db, **kwargs):
+    return paginate(
+        query=db.query(Post).order_by(Post.id), schema=PostSummary, **kwargs
+    )
+
+
+def test_count_exact(db, posts):
+    meta = _page(db, page=2, page_size=2).meta
+    assert meta["total"] == 5
+    assert meta["total_exact"] is True
+    assert meta["total_pages"] == 3
+    assert (meta["previous_page"], meta["next_page"]) == (1, 3)
+
+
+def test_count_cached_reuses_total(db, user, posts):
+    assert _page(db, count=CountMode.cached).meta["total"] == 5
+    db.add(Post(author_id=user.id, title="new"))
+    db.commit()
+
+    meta = _page(db, count=CountMode.cached).meta
+    assert meta["total"] == 5
+    assert meta["total_exact"] is False
+    assert _page(db, count=CountMode.exact).meta["total"] == 6
+
+
+def test_count_estimated_is_exact_off_postgres(db, posts):
+    meta = _page(db, count=CountMode.estimated).meta
+    assert (meta["total"], meta["total_exact"]) == (5, True)
+
+
+def test_count_none_still_finds_next_page(db, posts):
+    meta = _page(db, page=2, page_size=2, count=CountMode.none).meta
+    assert meta["total"] is None
+    assert meta["total_pages"] is None
+    assert meta["next_page"] == 3
+    assert (
+        _page(db, page=3, page_size=2, count=CountMode.none).meta["next_page"] is None
+    )
+
+
+def test_page_out_of_range(db, posts):
+    with pytest.raises(ValueError, match="Page not found"):
+        _page(db, page=4, page_size=2)
+    with pytest.raises(ValueError, match="Page not found"):
+        _page(db, page=4, page_size=2, count=CountMode.none)
+
+
+def test_fields_limits_schema_and_columns(db, posts):
+    page = paginate(
+        query=db.query(Post).order_by(Post.id),
+        schema=PostList,
+        fields="title, word_count",
+    )
+    assert [item.model_dump() for item in page.data][:2] == [
+        {"title": "t0", "word_count": 0},
+        {"title": "t1", "word_count": 0},
+    ]
+
+
+def test_only_schema_columns_are_selected(db, posts):
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        paginate(query=db.query(Post), schema=PostList, fields="title")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    page_query = statements[-1]
+    assert "posts.title" in page_query
+    assert "posts.content" not in page_query
+    assert "posts.excerpt" not in page_query
+
+
+def test_unknown_fields_are_rejected(db, posts):
+    with pytest.raises(ValueError, match="Unknown fields: nope"):
+        paginate(query=db.query(Post), schema=PostList, fields="title,nope")
@@ -0,0 +1,127 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from apps.stock import quotes, route
+from apps.stock.models import Stock
+from apps.stock.quotes import LocalQuoteBus, Quote, QuoteCache
+
+Row = namedtuple("Row", "id symbol price last_updated")
+
+
+def _at(second):
+    return datetime(2026, 1, 1, 10, 0, second, tzinfo=timezone.utc)
+
+
+def _quote(symbol="AAPL", price=100, last_updated=_at(0)):
+    return Quote(1, symbol, price, last_updated)
+
+
+def test_load_and_lookups(db):
+    db.add_all(
+        [
+            Stock(symbol="AAPL", company_name="Apple", price=100),
+            Stock(symbol="MSFT", company_name="Microsoft", price=200),
+        ]
+    )
+    db.commit()
+    cache = QuoteCache()
+    cache.load(db)
+
+    assert cache.warm
+    assert cache.get("AAPL").price == 100
+    assert cache.get("NOPE") is None
+    assert set(cache.get_many(["MSFT", "AAPL", "NOPE"])) == {"AAPL", "MSFT"}
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_older_quote_is_ignored():
+    cache = QuoteCache()
+    cache.apply([_quote(price=110, last_updated=_at(5))])
+    # an earlier commit whose notification arrived late
+    cache.apply([_quote(price=105, last_updated=_at(1))])
+    assert cache.get("AAPL").price == 110
+    assert cache.stale == 1
+
+    cache.apply([_quote(price=120, last_updated=_at(9))])
+    assert cache.get("AAPL").price == 120
+
+
+def test_freshness_compares_instants():
+    plus_one = timezone(timedelta(hours=1))
+    minus_five = timezone(timedelta(hours=-5))
+    cache = QuoteCache()
+    # as SQLite reads it back: naive, UTC
+    cache.apply([_quote(price=110, last_updated=datetime(2026, 1, 1, 10, 0, 5))])
+    # 09:00:09 UTC, older although later on its own clock
+    older = datetime(2026, 1, 1, 10, 0, 9, tzinfo=plus_one)
+    cache.apply([_quote(price=105, last_updated=older)])
+    assert cache.get("AAPL").price == 110
+    assert cache.stale == 1
+
+    # 10:00:07 UTC, newer although earlier on its own clock
+    newer = datetime(2026, 1, 1, 5, 0, 7, tzinfo=minus_five)
+    cache.apply([_quote(price=120, last_updated=newer)])
+    assert cache.get("AAPL").price == 120
+
+
+def test_rename_removes_old_symbol():
+    cache = QuoteCache()
+    cache.apply([_quote()])
+    cache.apply([_quote(symbol="AAPL2")], removed=["AAPL"])
+    assert cache.get("AAPL") is None
+    assert cache.get("AAPL2") is not None
+
+
+def test_changes_during_load_are_kept():
+    cache = QuoteCache()
+    created = Quote(2, "NVDA", 1, _at(2))
+    newer = _quote(price=130, last_updated=_at(3))
+
+    class Snapshot:
+        def execute(self, statement):
+            # committed and delivered after the snapshot was read
+            cache.apply([created, newer])
+            return self
+
+        def all(self):
+            return [Row(1, "AAPL", 100, _at(0))]
+
+    cache.load(Snapshot())
+    assert cache.get("NVDA") == created
+    assert cache.get("AAPL").price == 130
+
+
+def test_bus_starts_before_the_cache_loads(monkeypatch):
+    calls = []
+
+    class Bus(LocalQuoteBus):
+        def start(self, timeout=5.0):
+            calls.append("listen")
+
+    monkeypatch.setattr(quotes, "quote_bus", Bus())
+    monkeypatch.setattr(quotes, "_reload", lambda: calls.append("load"))
+    quotes.start_quote_cache()
+    assert calls == ["listen", "load"]
+
+
+def test_publish_reaches_subscribers():
+    bus = LocalQuoteBus()
+    cache = QuoteCache()
+    bus.subscribe(cache.apply)
+    bus.publish([_quote()], [])
+    assert cache.get("AAPL") == _quote()
+
+
+def test_warm_cache_never_opens_a_session(db, monkeypatch):
+    cache = QuoteCache()
+    cache.load(db)
+    cache.apply([_quote()])
+
+    def read_session():
+        raise AssertionError("warm cache must not touch the database")
+
+    monkeypatch.setattr(route, "quote_cache", cache)
+    monkeypatch.setattr(route, "read_session", read_session)
+    assert route.get_quote("AAPL").status_code == 200
+    assert route.get_quote("NOPE").status_code == 404
+    assert route._batch_quotes(["AAPL", "NOPE"]).status_code == 200
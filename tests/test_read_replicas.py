@@ -0,0 +1,72 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from apps import database
+from apps.database import ReplicaSelector
+
+
+@pytest.fixture
+def replica_url():
+    return f"sqlite:///{tempfile.mkdtemp()}/replica.db"
+
+
+def _use_replicas(monkeypatch, selector_name, *engines):
+    selector = ReplicaSelector(engines)
+    monkeypatch.setattr(database, selector_name, selector)
+    return selector
+
+
+def test_exhausted_replica_pool_falls_back_to_the_primary(monkeypatch, replica_url):
+    replica = create_engine(
+        replica_url, poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01
+    )
+    selector = _use_replicas(monkeypatch, "replica_selector", replica)
+    try:
+        with replica.connect():
+            with database.read_session() as db:
+                assert db.get_bind() is database.engine
+        # busy is not down, the replica is still tried next time
+        assert selector.candidates() == [replica]
+        with database.read_session() as db:
+            assert db.get_bind() is replica
+    finally:
+        replica.dispose()
+
+
+def test_unreachable_replica_is_marked_down(monkeypatch):
+    missing = os.path.join(tempfile.mkdtemp(), "missing", "replica.db")
+    replica = create_engine(f"sqlite:///{missing}")
+    selector = _use_replicas(monkeypatch, "replica_selector", replica)
+    with database.read_session() as db:
+        assert db.get_bind() is database.engine
+    assert selector.candidates() == []
+
+
+def test_exhausted_async_replica_pool_falls_back_to_the_primary(
+    monkeypatch, replica_url
+):
+    async def run():
+        replica = create_async_engine(
+            replica_url.replace("sqlite://", "sqlite+aiosqlite://"),
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.01,
+        )
+        _use_replicas(monkeypatch, "async_replica_selector", replica)
+        try:
+            async with replica.connect():
+                sessions = database.get_async_read_db()
+                db = await sessions.__anext__()
+                assert db.get_bind() is database.async_engine.sync_engine
+                await sessions.aclose()
+        finally:
+            await replica.dispose()
+
+    asyncio.run(run())
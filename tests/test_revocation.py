@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+from apps.authentication.models import RevokedToken
+from apps.authentication.revocation import BloomFilter, RevocationList
+from apps.database import SessionLocal
+
+
+def _expires(minutes=10):
+    return datetime.now(timezone.utc) + timedelta(minutes=minutes)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_revoke_once(db):
+    revocations = RevocationList(session_factory=SessionLocal)
+    assert revocations.revoke(db, "a", _expires(), user_id=1)
+    assert revocations.is_revoked("a")
+    assert not revocations.is_revoked("b")
+    # the unique jti makes a second revoke fail, refresh rotation relies on it
+    assert not revocations.revoke(db, "a", _expires(), user_id=1)
+
+
+def test_expired_revocation_no_longer_applies(db):
+    revocations = RevocationList(session_factory=SessionLocal)
+    revocations.add(
+        "old", (datetime.now(timezone.utc) - timedelta(seconds=1)).timestamp()
+    )
+    assert not revocations.is_revoked("old")
+
+
+def test_sync_picks_up_other_workers(db):
+    worker_a = RevocationList(session_factory=SessionLocal)
+    worker_b = RevocationList(session_factory=SessionLocal)
+    worker_b.sync()
+    worker_a.revoke(db, "from-a", _expires())
+    assert not worker_b.is_revoked("from-a")
+    worker_b.sync()
+    assert worker_b.is_revoked("from-a")
+
+
+def test_sync_sees_rows_committed_out_of_id_order(db):
+    now = datetime.now(timezone.utc)
+    db.add(
+        RevokedToken(
+            id=2,
+            jti="second",
+            token_type="access",
+            expires_at=_expires(),
+            created_at=now,
+        )
+    )
+    db.commit()
+    worker = RevocationList(session_factory=SessionLocal)
+    worker.sync()
+    assert worker.is_revoked("second")
+
+    # id 1 was allocated first but its transaction committed later
+    db.add(
+        RevokedToken(
+            id=1,
+            jti="first",
+            token_type="access",
+            expires_at=_expires(),
+            created_at=now - timedelta(seconds=5),
+        )
+    )
+    db.commit()
+    worker.sync()
+    assert worker.is_revoked("first")
+    assert worker.stats()["revoked"] == 2
+
+
+def test_sync_purges_expired_rows(db):
+    db.add(
+        RevokedToken(
+            jti="stale",
+            token_type="access",
+            expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        )
+    )
+    db.commit()
+    worker = RevocationList(session_factory=SessionLocal)
+    worker.sync()
+    assert not worker.is_revoked("stale")
+    assert db.query(RevokedToken).count() == 0
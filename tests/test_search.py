@@ -0,0 +1,36 @@
+from apps.blog import search
+from apps.blog.models import Post
+
+
+def _posts(db, user):
+    db.add_all(
+        [
+            Post(author_id=user.id, title="Rust <tips>", content="borrow checker"),
+            Post(author_id=user.id, title="Python tips", content="100% typed_code"),
+            Post(author_id=user.id, title="Cooking", content="no code here"),
+        ]
+    )
+    db.commit()
+
+
+def test_full_text_search_ranks_and_highlights(db, user):
+    _posts(db, user)
+    rows = search.search_posts(db, "tips", limit=10)
+
+    assert {row["title"] for row in rows} == {"Rust <tips>", "Python tips"}
+    rust = next(row for row in rows if row["title"] == "Rust <tips>")
+    assert rust["title_highlight"] == "Rust &lt;<mark>tips</mark>&gt;"
+
+
+def test_other_databases_fall_back_to_like(db, user, monkeypatch):
+    _posts(db, user)
+    monkeypatch.setattr(db.get_bind().dialect, "name", "mssql")
+    rows = search.search_posts(db, "TIPS", limit=10)
+
+    assert [row["title"] for row in rows] == ["Python tips", "Rust <tips>"]
+    assert rows[1]["title_highlight"] == "Rust &lt;<mark>tips</mark>&gt;"
+    # LIKE wildcards in the query are literal
+    assert [row["title"] for row in search.search_posts(db, "0%", limit=10)] == [
+        "Python tips"
+    ]
+    assert [row["title"] for row in search.search_posts(db, "o_c", limit=10)] == []
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+
+import pytest
+from fastapi import HTTPException
+
+from apps.authentication import throttling
+from apps.authentication.throttling import MemoryThrottleBackend, Throttle
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(throttling.time, "monotonic", clock)
+    return clock
+
+
+def test_burst_then_429_with_retry_after(clock):
+    throttle = Throttle("login:ip", rate=60, burst=3, backend=MemoryThrottleBackend())
+    for _ in range(3):
+        throttle.check("1.2.3.4")
+    with pytest.raises(HTTPException) as exc_info:
+        throttle.check("1.2.3.4")
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert throttle.rejected == 1
+    # other keys have their own bucket
+    throttle.check("5.6.7.8")
+
+
+def test_tokens_refill_over_time(clock):
+    backend = MemoryThrottleBackend()
+    assert backend.consume("k", rate=1, capacity=1) == 0
+    assert backend.consume("k", rate=1, capacity=1) == pytest.approx(1)
+    clock.now += 0.5
+    assert backend.consume("k", rate=1, capacity=1) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert backend.consume("k", rate=1, capacity=1) == 0
+
+
+def test_least_recently_touched_bucket_is_dropped(clock):
+    backend = MemoryThrottleBackend(max_keys=2)
+    backend.consume("a", rate=1, capacity=5)
+    backend.consume("b", rate=1, capacity=5)
+    backend.consume("a", rate=1, capacity=5)
+    backend.consume("c", rate=1, capacity=5)
+    assert list(backend._buckets) == ["a", "c"]
+    assert backend.stats()["evicted"] == 1
+
+
+def test_full_buckets_are_swept_on_the_timer(clock):
+    backend = MemoryThrottleBackend(evict_interval=60)
+    backend.consume("idle", rate=1, capacity=5)
+    backend.consume("slow", rate=0.01, capacity=5)
+    clock.now += 61
+    backend.consume("new", rate=1, capacity=5)
+    # idle refilled after 5s, slow needs 500s
+    assert list(backend._buckets) == ["slow", "new"]
+
+
+class CountingBuckets(OrderedDict):
+    """Counts full passes over the buckets, which would make consume O(n)"""
+
+    scans = 0
+
+    def __iter__(self):
+        self.scans += 1
+        return super().__iter__()
+
+    def items(self):
+        self.scans += 1
+        return super().items()
+
+    def values(self):
+        self.scans += 1
+        return super().values()
+
+
+def test_consume_stays_constant_time_at_the_cap(clock):
+    backend = MemoryThrottleBackend(max_keys=1000)
+    backend._buckets = CountingBuckets()
+    for i in range(1000):
+        backend.consume(f"fill-{i}", rate=1, capacity=5)
+    for i in range(500):
+        backend.consume(f"spray-{i}", rate=1, capacity=5)
+
+    # each new key dropped exactly the oldest one, without a scan or sort
+    assert backend._buckets.scans == 0
+    assert backend.evicted == 500
+    assert "fill-499" not in backend._buckets
+    assert next(reversed(backend._buckets)) == "spray-499"
+    assert backend.stats()["keys"] == 1000
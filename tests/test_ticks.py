@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from apps.stock import route
+from apps.stock.models import Stock, StockHistory
+from apps.stock.schema import StockCreateSchema, StockUpdateSchema
+from apps.stock.schema.tick import TickSchema
+
+
+def _ingest(db, *ticks):
+    response = route.ingest_ticks(
+        [TickSchema.model_validate(tick) for tick in ticks], db=db
+    )
+    assert response.status_code == 200
+    return json.loads(response.body)["data"]
+
+
+def _stock(db, last_updated="2026-01-01T09:00:00Z"):
+    response = route.create_stock(
+        StockCreateSchema(
+            symbol="AAPL", company_name="Apple", price=100, last_updated=last_updated
+        ),
+        db=db,
+    )
+    assert response.status_code == 201
+    stock = db.query(Stock).filter(Stock.symbol == "AAPL").one()
+    return stock
+
+
+def _price(db, stock):
+    db.expire_all()
+    return db.get(Stock, stock.id).price
+
+
+def test_out_of_order_tick_only_adds_history(db):
+    stock = _stock(db)
+    _ingest(db, {"symbol": "AAPL", "price": 110, "timestamp": "2026-01-01T10:00:05Z"})
+    # sent earlier, delivered late
+    data = _ingest(
+        db, {"symbol": "AAPL", "price": 90, "timestamp": "2026-01-01T10:00:01Z"}
+    )
+
+    assert data["accepted"] == 1
+    assert data["updated_stocks"] == 0
+    assert _price(db, stock) == 110
+    assert db.query(StockHistory).filter_by(stock_id=stock.id).count() == 3
+
+
+def test_ticks_compare_by_instant_not_spelling(db):
+    stock = _stock(db)
+    # 10:00 UTC
+    _ingest(
+        db, {"symbol": "AAPL", "price": 110, "timestamp": "2026-01-01T12:00:00+02:00"}
+    )
+    # naive and space-separated, taken as UTC: 10:30 UTC, newer
+    data = _ingest(
+        db, {"symbol": "AAPL", "price": 120, "timestamp": "2026-01-01 10:30:00"}
+    )
+    assert data["updated_stocks"] == 1
+    assert _price(db, stock) == 120
+
+    # 09:00 UTC, older although its text sorts after "2026-01-01 10:30"
+    data = _ingest(
+        db, {"symbol": "AAPL", "price": 80, "timestamp": "2026-01-01T11:00:00+02:00"}
+    )
+    assert data["updated_stocks"] == 0
+    assert _price(db, stock) == 120
+
+
+def test_last_updated_is_stored_as_utc(db):
+    stock = _stock(db, last_updated="2026-01-01 12:00:00+02:00")
+    assert stock.last_updated.replace(tzinfo=timezone.utc) == datetime(
+        2026, 1, 1, 10, tzinfo=timezone.utc
+    )
+
+    route.update_stock(
+        stock.id, StockUpdateSchema(last_updated="2026-01-01T08:00:00-03:00"), db=db
+    )
+    db.expire_all()
+    assert db.get(Stock, stock.id).last_updated.replace(
+        tzinfo=timezone.utc
+    ) == datetime(2026, 1, 1, 11, tzinfo=timezone.utc)
+
+
+def test_last_updated_must_be_a_timestamp():
+    with pytest.raises(ValidationError):
+        StockUpdateSchema(last_updated="yesterday")